@@ -0,0 +1,371 @@
+#Benchmarks for the planners in dijkstra_Vedant_Ranade.py
+#Run with: python3 benchmark.py
+#Imports
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import dijkstra_Vedant_Ranade as planner
+import map_cache
+
+#README scenarios as (start,end) in the (Y,X) coordinates typed at the prompt, Y grows upwards
+README_SCENARIOS = {"PathVizRand1":((6,6),(120,594)),"PathVizRand2":((6,6),(80,80))}
+
+#Expansion counts of each mode next to the legacy dikstra() on the README scenarios
+#The legacy solver does not count expansions, the number reported for it is the size of its visited set
+def compareExpansions(modes=("dijkstra","jps"),legacy=True,scenarios=README_SCENARIOS):
+    rows = []
+    for name,(start,end) in scenarios.items():
+        start,end = planner.flipY(start),planner.flipY(end)
+        if legacy:
+            before = time.time()
+            node,visited = planner.dikstra(start,end)
+            rows.append((name,"dikstra()",node.cost if node else None,len(visited) if visited else 0,time.time()-before))
+        for mode in modes:
+            before = time.time()
+            result = planner.PLANNERS[mode](start,end)
+            rows.append((name,mode,result.cost,result.expanded,time.time()-before))
+    return rows
+
+def printRows(rows):
+    print("\r\n{:<14}{:<22}{:>12}{:>12}{:>10}".format("SCENARIO","PLANNER","COST","EXPANDED","SECONDS"))
+    for name,mode,cost,expanded,seconds in rows:
+        cost = "-" if cost is None else "{:.1f}".format(cost)
+        print("{:<14}{:<22}{:>12}{:>12}{:>10.3f}".format(name,mode,cost,expanded,seconds))
+
+#Build time, corner to corner search time and peak memory against map size
+#The map keeps its 250x600 mm obstacles and gets finer, so a width of N cells is resolution 600/N
+#Peak traced memory is what numpy and python allocated during the search, ru_maxrss is the peak of the whole process so far
+def compareSizes(widths=(600,1200,2400,4800),mode="astar",traceMemory=True):
+    rows = []
+    for width in widths:
+        planner.configureMap(planner.MAP_HEIGHT,planner.MAP_WIDTH,planner.MAP_WIDTH/width)
+        before = time.time()
+        grid = planner.getOccupancyGrid()
+        built = time.time()-before
+        ybound,xbound = planner.mapBounds()
+        start,end = (ybound[-1],xbound[0]),(ybound[0],xbound[-1])
+        before = time.time()
+        result = planner.PLANNERS[mode](start,end,grid)
+        searched = time.time()-before
+        #tracemalloc slows every allocation down, so the peak comes from a second run
+        peak = None
+        if traceMemory:
+            tracemalloc.start()
+            planner.PLANNERS[mode](start,end,grid)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        rows.append((grid.HEIGHT*grid.WIDTH,grid.nbytes,result.cost,result.expanded,built,searched,peak,rss))
+    planner.configureMap()
+    return rows
+
+def printSizes(rows):
+    print("\r\n{:>12}{:>12}{:>12}{:>12}{:>10}{:>10}{:>12}{:>12}".format("CELLS","GRID MB","COST","EXPANDED","BUILD S","SEARCH S","PEAK MB","MAXRSS MB"))
+    for cells,gridBytes,cost,expanded,built,searched,peak,rss in rows:
+        cost = "-" if cost is None else "{:.1f}".format(cost)
+        peak = "-" if peak is None else "{:.1f}".format(peak/2**20)
+        print("{:>12}{:>12.2f}{:>12}{:>12}{:>10.3f}{:>10.3f}{:>12}{:>12.1f}".format(cells,gridBytes/2**20,cost,expanded,built,searched,peak,rss/2**10))
+
+#Replanning cost of D* Lite next to a new search, for map widths in cells and sizes of a new square obstacle
+#The obstacle is dropped on the path AHEAD cells in front of the robot, the way a sensor would find it, and removed again
+AHEAD = 20
+def compareReplanning(widths=(600,1200,2400),changes=(1,4,16),mode="astar"):
+    import dstar_lite
+    rows = []
+    for width in widths:
+        planner.configureMap(planner.MAP_HEIGHT,planner.MAP_WIDTH,planner.MAP_WIDTH/width)
+        shared = planner.getOccupancyGrid()
+        #The replanner changes its grid, so it works on a copy
+        grid = planner.OccupancyGrid.fromBits(shared.bits.copy(),shared.HEIGHT,shared.WIDTH)
+        ybound,xbound = planner.mapBounds()
+        start,end = (ybound[-1],xbound[0]),(ybound[0],xbound[-1])
+        replanner = dstar_lite.DStarLite(start,end,grid)
+        path = replanner.plan().path
+        for size in changes:
+            y,x = path[min(AHEAD,len(path)-1)]
+            cells = [(y+dy,x+dx) for dy in range(-(size//2),size-size//2) for dx in range(-(size//2),size-size//2)]
+            cells = [cell for cell in cells if cell not in (start,end) and 0<=cell[0]<grid.HEIGHT and 0<=cell[1]<grid.WIDTH]
+            before = time.time()
+            result = replanner.updateCells(cells,True)
+            replanned = time.time()-before
+            before = time.time()
+            fresh = planner.PLANNERS[mode](start,end,grid)
+            searched = time.time()-before
+            rows.append((grid.HEIGHT*grid.WIDTH,len(cells),result.cost,replanner.expanded,replanned,fresh.cost,fresh.expanded,searched))
+            path = replanner.updateCells(cells,False).path
+    planner.configureMap()
+    return rows
+
+def printReplanning(rows):
+    print("\r\n{:>12}{:>9}{:>10}{:>13}{:>10}{:>10}{:>13}{:>10}".format("CELLS","CHANGED","COST","REPLAN EXP","REPLAN S","COST","SEARCH EXP","SEARCH S"))
+    for cells,changed,cost,expanded,replanned,freshCost,freshExpanded,searched in rows:
+        cost = "-" if cost is None else "{:.1f}".format(cost)
+        freshCost = "-" if freshCost is None else "{:.1f}".format(freshCost)
+        print("{:>12}{:>9}{:>10}{:>13}{:>10.3f}{:>10}{:>13}{:>10.3f}".format(cells,changed,cost,expanded,replanned,freshCost,freshExpanded,searched))
+
+#Suite of fixed scenarios, every phase timed on its own, saved as JSON to compare revisions
+#Scenarios are (start,end) in prompt coordinates, "corner" goes from the bottom left to the top right free cell,
+#"unreachable" is the README query with its goal walled in by a ring of blocked cells, every reachable cell is expanded
+SUITE_SCENARIOS = dict(README_SCENARIOS,corner=None,unreachable=README_SCENARIOS["PathVizRand1"])
+#Radius of the ring around the goal of "unreachable"
+WALL_RADIUS = 3
+#Modes whose result.moves backTrackMoves follows from the goal
+BACKTRACK_MODES = ("dijkstra","astar")
+#A phase slower than in the compared file by more than this fraction is reported as a regression
+REGRESSION = 0.10
+#and by more than this many seconds, timer noise on the sub millisecond phases is not a regression
+NOISE_SECONDS = 0.002
+
+#(name,start,end,grid) of the suite in (row,column) cells, the unreachable scenario gets a copy of the grid with the wall
+def suiteScenarios(names=None):
+    shared = planner.getOccupancyGrid()
+    scenarios = []
+    for name in (SUITE_SCENARIOS if names is None else names):
+        if name=="corner":
+            ybound,xbound = planner.mapBounds()
+            scenarios.append((name,(ybound[-1],xbound[0]),(ybound[0],xbound[-1]),shared))
+            continue
+        start,end = map(planner.flipY,SUITE_SCENARIOS[name])
+        grid = shared
+        if name=="unreachable":
+            grid = planner.OccupancyGrid.fromBits(shared.bits.copy(),shared.HEIGHT,shared.WIDTH)
+            ring = [(end[0]+dy,end[1]+dx) for dy in range(-WALL_RADIUS,WALL_RADIUS+1) for dx in range(-WALL_RADIUS,WALL_RADIUS+1) if max(abs(dy),abs(dx))==WALL_RADIUS]
+            grid.setFree(ring,False)
+        scenarios.append((name,start,end,grid))
+    return scenarios
+
+#Seconds of the fastest of repeat calls of function, and its last return value
+def fastest(function,repeat):
+    best,value = float("inf"),None
+    for _ in range(repeat):
+        before = time.perf_counter()
+        value = function()
+        best = min(best,time.perf_counter()-before)
+    return best,value
+
+#Seconds to build the occupancy grid without the map cache and to load it from the cache
+def timeMapGeneration(repeat=1):
+    enabled = map_cache.CACHE_ENABLED
+    try:
+        map_cache.CACHE_ENABLED = False
+        cold,_ = fastest(planner.buildOccupancyGrid,repeat)
+    finally:
+        map_cache.CACHE_ENABLED = enabled
+    planner.buildOccupancyGrid()
+    warm,_ = fastest(planner.buildOccupancyGrid,repeat)
+    obstacleMap,_ = fastest(lambda:(planner.MAPS.pop("OBSTACLE_MAP",None),planner.getObstacleMap()),repeat)
+    return {"occupancyBuild":cold,"occupancyCacheLoad":warm,"obstacleMap":obstacleMap}
+
+#Phases of one scenario and mode: search (with the backtrack), backtrack alone, frame preparation (frame ends and
+#painting every frame) and encoding, with the fastest of repeat runs, and the peak traced memory of a second search
+def runScenario(name,start,end,grid,mode,repeat=1,video=True,traceMemory=True):
+    record = {"scenario":name,"mode":mode,"start":list(start),"end":list(end)}
+    search,result = fastest(lambda:planner.PLANNERS[mode](start,end,grid),repeat)
+    record.update(cost=result.cost,expanded=result.expanded,steps=max(len(result.path)-1,0))
+    phases = {"search":search}
+    if mode in BACKTRACK_MODES and result.found():
+        phases["backtrack"],_ = fastest(lambda:planner.backTrackMoves(result.moves,grid.index(*end),grid),repeat)
+    if video and result.found() and grid is planner.getOccupancyGrid():
+        import visualization
+        recorded = planner.PLANNERS[mode](start,end,grid,recordOrder=True)
+        def prepare():
+            frameEnds = planner.expansionFrames(recorded,grid)
+            return frameEnds,sum(1 for _ in visualization.renderFrames(recorded,frameEnds))
+        phases["frames"],(frameEnds,frames) = fastest(prepare,repeat)
+        with tempfile.TemporaryDirectory() as folder:
+            stats = visualization.writeVideo(visualization.renderFrames(recorded,frameEnds),os.path.join(folder,"video.mp4"),15,frames,0,False)
+        phases["encode"] = stats.encodeTime
+        record["frames"] = frames
+    record["phases"] = phases
+    record["expansionsPerSecond"] = result.expanded/search if search else None
+    record["peakBytes"] = None
+    if traceMemory:
+        tracemalloc.start()
+        planner.PLANNERS[mode](start,end,grid)
+        record["peakBytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return record
+
+#The legacy dikstra() and backTrack on the scenarios that use the shared grid, it is slow (seconds per query)
+def runLegacy(name,start,end):
+    before = time.perf_counter()
+    node,visited = planner.dikstra(start,end)
+    searched = time.perf_counter()-before
+    before = time.perf_counter()
+    path = planner.backTrack(node)
+    backtracked = time.perf_counter()-before
+    expanded = len(visited) if visited else 0
+    return {"scenario":name,"mode":"dikstra()","start":list(start),"end":list(end),"cost":node.cost if node else None,
+            "expanded":expanded,"steps":max(len(path)-1,0),"phases":{"search":searched,"backtrack":backtracked},
+            "expansionsPerSecond":expanded/searched if searched else None,"peakBytes":None}
+
+def revision():
+    try:
+        return subprocess.run(["git","rev-parse","--short","HEAD"],cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True,text=True,check=True).stdout.strip()
+    except (OSError,subprocess.CalledProcessError):
+        return None
+
+#Everything the suite measures, as a JSON ready dict
+def runSuite(modes=("dijkstra","astar","jps"),names=None,repeat=3,legacy=False,video=True,traceMemory=True):
+    import cv2
+    report = {"revision":revision(),"time":time.strftime("%Y-%m-%dT%H:%M:%S"),"python":platform.python_version(),
+              "numpy":np.__version__,"opencv":cv2.__version__,"machine":platform.machine(),"cpus":os.cpu_count(),
+              "repeat":repeat,"map":{"cells":list(planner.mapShape()[:2]),"resolution":planner.RESOLUTION}}
+    report["mapGeneration"] = timeMapGeneration(repeat)
+    results = []
+    for name,start,end,grid in suiteScenarios(names):
+        if legacy and grid is planner.getOccupancyGrid():
+            results.append(runLegacy(name,start,end))
+        for mode in modes:
+            results.append(runScenario(name,start,end,grid,mode,repeat,video,traceMemory))
+    report["results"] = results
+    report["maxrssBytes"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss*1024
+    return report
+
+def printSuite(report):
+    print("\r\nREVISION {} MAP {} x {} REPEAT {}".format(report["revision"],*report["map"]["cells"],report["repeat"]))
+    print(" ".join("{}:{:.3f}s".format(phase,seconds) for phase,seconds in report["mapGeneration"].items()))
+    print("{:<14}{:<12}{:>10}{:>10}{:>10}{:>10}{:>10}{:>10}{:>12}{:>10}".format("SCENARIO","PLANNER","COST","EXPANDED","SEARCH S","BACK S","FRAMES S","ENCODE S","EXP/S","PEAK MB"))
+    for record in report["results"]:
+        phases = record["phases"]
+        cell = lambda phase:"-" if phase not in phases else "{:.4f}".format(phases[phase])
+        cost = "-" if record["cost"] is None else "{:.1f}".format(record["cost"])
+        peak = "-" if record["peakBytes"] is None else "{:.1f}".format(record["peakBytes"]/2**20)
+        print("{:<14}{:<12}{:>10}{:>10}{:>10}{:>10}{:>10}{:>10}{:>12.0f}{:>10}".format(record["scenario"],record["mode"],cost,record["expanded"],
+              cell("search"),cell("backtrack"),cell("frames"),cell("encode"),record["expansionsPerSecond"] or 0,peak))
+
+#Phases of report slower than in old by more than threshold, and results whose cost or expansion count changed
+#Returns the list of regressions as strings, printed as well
+def compareSuites(old,report,threshold=REGRESSION):
+    regressions = []
+    previous = {(record["scenario"],record["mode"]):record for record in old["results"]}
+    print("\r\nCOMPARED WITH REVISION {} (new/old seconds)".format(old.get("revision")))
+    rows = [("map",phase,old["mapGeneration"].get(phase),seconds) for phase,seconds in report["mapGeneration"].items()]
+    for record in report["results"]:
+        before = previous.get((record["scenario"],record["mode"]))
+        if before is None:
+            continue
+        if before["cost"]!=record["cost"] or before["expanded"]!=record["expanded"]:
+            regressions.append("{} {}: cost {} expanded {} was cost {} expanded {}".format(record["scenario"],record["mode"],record["cost"],record["expanded"],before["cost"],before["expanded"]))
+        for phase,seconds in record["phases"].items():
+            rows.append(("{} {}".format(record["scenario"],record["mode"]),phase,before["phases"].get(phase),seconds))
+    for name,phase,oldSeconds,seconds in rows:
+        if not oldSeconds:
+            continue
+        ratio = seconds/oldSeconds
+        flag = ""
+        if ratio > 1+threshold and seconds-oldSeconds > NOISE_SECONDS:
+            flag = " SLOWER"
+            regressions.append("{} {}: {:.4f}s was {:.4f}s".format(name,phase,seconds,oldSeconds))
+        print("{:<28}{:<20}{:>8.2f}{}".format(name,phase,ratio,flag))
+    for regression in regressions:
+        print("REGRESSION "+regression)
+    return regressions
+
+#Map building and point queries with a scene of count random obstacles on a height x width mm map (resolution 1)
+#The spatial index is compared with testing every obstacle on every cell, which is timed on NAIVE_ROWS rows and
+#NAIVE_POINTS points and scaled to the whole map and to all the points
+NAIVE_ROWS = 8
+NAIVE_POINTS = 100
+def compareScene(count=10000,height=2000,width=5000,points=10000,mode="astar"):
+    import scene
+    rows = []
+    before = time.perf_counter()
+    obstacles = scene.randomScene(count,height,width)
+    rows.append(("index build",time.perf_counter()-before,None))
+    planner.configureScene(obstacles)
+    shape = planner.mapShape()
+    before = time.perf_counter()
+    mask = obstacles.mask(shape)
+    indexed = time.perf_counter()-before
+    before = time.perf_counter()
+    ys,xs = np.mgrid[0:NAIVE_ROWS,0:shape[1]]
+    naive = np.zeros(ys.shape,dtype=bool)
+    for kind,outline in obstacles.obstacles:
+        naive |= scene.shapeMask(kind,outline,xs,ys)
+    naiveSeconds = (time.perf_counter()-before)*shape[0]/NAIVE_ROWS
+    if not np.array_equal(naive,mask[:NAIVE_ROWS]):
+        print("INDEXED AND NAIVE MASKS DIFFER")
+    rows.append(("obstacle mask",indexed,naiveSeconds))
+    enabled = map_cache.CACHE_ENABLED
+    map_cache.CACHE_ENABLED = False
+    try:
+        before = time.perf_counter()
+        grid = planner.getOccupancyGrid()
+        rows.append(("occupancy grid",time.perf_counter()-before,None))
+    finally:
+        map_cache.CACHE_ENABLED = enabled
+    rng = np.random.default_rng(1)
+    queries = np.column_stack([rng.uniform(0,width,points),rng.uniform(0,height,points)])
+    before = time.perf_counter()
+    inside = [obstacles.contains(x,y) for x,y in queries]
+    indexedQueries = time.perf_counter()-before
+    before = time.perf_counter()
+    for x,y in queries[:NAIVE_POINTS]:
+        any(scene.shapeMask(kind,outline,x,y) for kind,outline in obstacles.obstacles)
+    rows.append(("{} point queries".format(points),indexedQueries,(time.perf_counter()-before)*points/NAIVE_POINTS))
+    free = np.argwhere(grid.freeMask())
+    start,end = tuple(free[0]),tuple(free[-1])
+    before = time.perf_counter()
+    result = planner.PLANNERS[mode](start,end,grid)
+    rows.append(("{} corner to corner".format(mode),time.perf_counter()-before,None))
+    planner.configureScene()
+    planner.configureMap()
+    return count,shape[0]*shape[1],sum(inside)/points,result,rows
+
+def printScene(report):
+    count,cells,covered,result,rows = report
+    cost = "-" if result.cost is None else "{:.1f}".format(result.cost)
+    print("\r\n{} OBSTACLES {} CELLS {:.0f}% OF POINTS INSIDE AN OBSTACLE, PATH COST {} EXPANDED {}".format(count,cells,covered*100,cost,result.expanded))
+    print("{:<28}{:>12}{:>14}".format("","INDEXED S","NAIVE S"))
+    for name,seconds,naive in rows:
+        print("{:<28}{:>12.3f}{:>14}".format(name,seconds,"-" if naive is None else "{:.1f} (est.)".format(naive)))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare planner expansion counts on the README scenarios")
+    parser.add_argument("--modes",nargs="+",choices=list(planner.PLANNERS),help="planners to compare, dijkstra and jps by default (dijkstra, astar and jps with --suite)")
+    parser.add_argument("--no-legacy",action="store_true",help="skip the slow legacy dikstra()")
+    parser.add_argument("--sizes",nargs="*",type=int,metavar="WIDTH",help="instead time one search per map width in cells, for example 600 1200 2400 4800 10000")
+    parser.add_argument("--size-mode",default="astar",choices=list(planner.PLANNERS),help="planner used with --sizes and --replan")
+    parser.add_argument("--no-trace",action="store_true",help="with --sizes or --suite, skip the traced second run that measures peak memory")
+    parser.add_argument("--replan",nargs="*",type=int,metavar="WIDTH",help="instead time D* Lite replanning after a new obstacle per map width in cells, for example 600 1200 2400")
+    parser.add_argument("--suite",action="store_true",help="instead run the benchmark suite: README, corner to corner and unreachable scenarios, every phase timed")
+    parser.add_argument("--scenarios",nargs="+",choices=list(SUITE_SCENARIOS),help="with --suite, only these scenarios")
+    parser.add_argument("--repeat",type=int,default=3,help="with --suite, the fastest of this many runs is kept")
+    parser.add_argument("--legacy",action="store_true",help="with --suite, also time the legacy dikstra() and backTrack")
+    parser.add_argument("--no-video",action="store_true",help="with --suite, skip frame preparation and encoding")
+    parser.add_argument("--json",metavar="FILE",help="with --suite, save the results to FILE")
+    parser.add_argument("--compare",metavar="FILE",help="with --suite, compare with the results saved in FILE, exit status 1 on regressions")
+    parser.add_argument("--scene",nargs="?",type=int,const=10000,metavar="COUNT",help="instead time map building and point queries with COUNT random obstacles (10000 by default)")
+    parser.add_argument("--changes",nargs="+",type=int,default=[1,4,16],metavar="SIZE",help="side in cells of the square obstacle used with --replan")
+    args = parser.parse_args(argv)
+    if args.scene is not None:
+        printScene(compareScene(args.scene,mode=args.size_mode))
+    elif args.suite:
+        modes = ["dijkstra","astar","jps"] if args.modes is None else args.modes
+        report = runSuite(modes,args.scenarios,args.repeat,args.legacy,not args.no_video,not args.no_trace)
+        printSuite(report)
+        if args.json:
+            with open(args.json,"w") as file:
+                json.dump(report,file,indent=1)
+        if args.compare:
+            with open(args.compare) as file:
+                sys.exit(1 if compareSuites(json.load(file),report) else 0)
+    elif args.replan is not None:
+        printReplanning(compareReplanning(args.replan or (600,1200,2400),args.changes,args.size_mode))
+    elif args.sizes is not None:
+        printSizes(compareSizes(args.sizes or (600,1200,2400,4800),args.size_mode,not args.no_trace))
+    else:
+        printRows(compareExpansions(["dijkstra","jps"] if args.modes is None else args.modes,not args.no_legacy))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+#Shared setup of the tests: run them without the on disk map cache and put the planner settings back after every test
+#Imports
+import os
+import random
+os.environ.setdefault("PLANNER_CACHE","0")
+import numpy as np
+import pytest
+import dijkstra_Vedant_Ranade as planner
+
+@pytest.fixture(autouse=True)
+def plannerSettings():
+    settings = planner.mapSettings()
+    yield
+    planner.applySettings(settings)
+
+#Copy of the occupancy grid of the configured map, tests that change cells leave the shared grid alone
+@pytest.fixture
+def copyGrid():
+    def copy():
+        grid = planner.getOccupancyGrid()
+        return planner.OccupancyGrid.fromBits(grid.bits.copy(),grid.HEIGHT,grid.WIDTH)
+    return copy
+
+#count free cells of the configured map drawn with seed, the same cells on every run
+@pytest.fixture
+def randomCells():
+    def sample(count,seed=0):
+        free = np.argwhere(planner.getOccupancyGrid().freeMask())
+        rng = random.Random(seed)
+        return [tuple(free[rng.randrange(len(free))].tolist()) for _ in range(count)]
+    return sample
+
+#count (start,goal) pairs of free cells, each pair two cells in a row of randomCells
+@pytest.fixture
+def randomQueries(randomCells):
+    def sample(count,seed=0):
+        cells = randomCells(2*count,seed)
+        return list(zip(cells[::2],cells[1::2]))
+    return sample
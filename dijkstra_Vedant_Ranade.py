@@ -1,26 +1,42 @@
+#Planner library, importing it has no side effects: the obstacle map is built on first use
+#The command line interface is dijkstra_cli.py and the video rendering is visualization.py
 #Imports
 #Libraries
 import numpy as np
-import cv2
-from tqdm import tqdm
 #Inbuilt modules
 from queue import PriorityQueue as pq
 from ordered_set import OrderedSet
+from heapq import heappush,heappop
+from collections import OrderedDict
+from multiprocessing import Pool,shared_memory
+import os
 import copy
+import inspect
 import typing
 import time
+import tracemalloc
+#Project modules
+import map_cache
 
 ## Constants
 # y direction is a row # x direction is a column. Operations are y,x or row,column
-print("\r\nGENERATING OBSTACLE MAP")
-YBOUND = range(5,245,1) # Padding of 5mm on each dimension
-XBOUND = range(5,595,1) # Padding of 5mm on each dimension
 ACTIONS = {"U":(+1,0),"D":(-1,0),"L":(0,-1),"R":(0,+1),"UL":(+1,-1),"UR":(+1,+1),"DR":(-1,+1),"DL":(-1,-1)}
 DIAGONAL_COST = 1.4
 SIDEWAY_COST = 1.0
 COSTFORACTION = {"U":SIDEWAY_COST,"D":SIDEWAY_COST,"L":SIDEWAY_COST,"R":SIDEWAY_COST,"UL":DIAGONAL_COST,"UR":DIAGONAL_COST,"DR":DIAGONAL_COST,"DL":DIAGONAL_COST}
 OBSTACLE_COLOR = [255,0,0]
-obstacle_image = np.full((YBOUND[-1]+5+1,XBOUND[-1]+5+1,3),125,dtype=np.uint8)
+MAP_HEIGHT = 250 # mm
+MAP_WIDTH = 600 # mm
+RESOLUTION = 1.0 # mm per cell, cell (y,x) is the point (x,y)*RESOLUTION of the map
+CLEARANCE = 5 # Free space kept around obstacles and walls, the planner grid is the obstacles grown by CLEARANCE+ROBOT_RADIUS
+ROBOT_RADIUS = 0 # Point robot
+DISTANCE_FIELD_CELLS = 2**22 # Largest map (cells) whose obstacle distance field is kept and shared by every robot size
+SCENE = None # Obstacle scene of scene.py used instead of the README obstacles, see configureScene
+LAZY = None # Tile size and tile cap of the lazy occupancy grid, None builds the whole grid up front, see configureLazy
+
+#(rows,columns,3) of the map at the current size and resolution
+def mapShape():
+    return (int(round(MAP_HEIGHT/RESOLUTION)),int(round(MAP_WIDTH/RESOLUTION)),3)
 # Define obstacles
 # Define Rectangles
 def rectangle1(pixelCoordinate):
@@ -67,15 +83,492 @@ def triangle(pixelCoordinates):
     else:
         return True
     
+# Vectorized obstacle masks
+# These evaluate the same half-plane tests as the predicates above, but on whole coordinate grids at once
+# They return True inside the obstacle (the predicates return False there)
+def rectangle1Mask(xs,ys):
+    return (xs > (100-5)) & (xs<(150+5)) & (ys<(100+5))
+
+def rectangle2Mask(xs,ys):
+    return (xs > (100-5)) & (xs<(150+5)) & (ys>(150-5))
+
+def hexagonMask(xs,ys):
+    line1Cond = ys - line1[0]*xs - line1[1] <0
+    line2Cond = ys - line2[0]*xs - line2[1] <0
+    line3Cond = ys - line3[0]*xs - line3[1] >0
+    line4Cond = ys - line4[0]*xs - line4[1] >0
+    return line1Cond & line2Cond & line3Cond & line4Cond & (xs>230.7) & (xs<369.3)
+
+def triangleMask(xs,ys):
+    side1Cond = ys - side1[0]*xs - side1[1] <0
+    side2Cond = ys - side2[0]*xs - side2[1] >0
+    return side1Cond & side2Cond & (xs>455)
+
+#Boolean (rows,columns) mask of every pixel covered by an obstacle
+#Pixels are scaled by the resolution, at resolution 1 the coordinates stay integers so the map is the same as the per pixel one
+def obstacleMask(shape,resolution=1):
+    ys,xs = np.indices(shape[:2])
+    if resolution != 1:
+        ys,xs = ys*resolution,xs*resolution
+    return triangleMask(xs,ys) | rectangle1Mask(xs,ys) | rectangle2Mask(xs,ys) | hexagonMask(xs,ys)
+
 def npObstacleMap(image):
+    image[obstacleMask(image.shape)] = OBSTACLE_COLOR
+    return image
+
+#Per pixel reference rasterizer, this is the original implementation and is only used to verify npObstacleMap
+def npObstacleMapPerPixel(image):
     for y in range(image.shape[0]):
         for x in range(image.shape[1]):
             if (not triangle((x,y))) or (not rectangle1((x,y))) or (not rectangle2((x,y))) or (not hexagon((x,y))):
                 image[y,x] = OBSTACLE_COLOR
     return image
 
-OBSTACLE_MAP = npObstacleMap(obstacle_image)
-print("\r\nFINISHED GENERATING OBSTACLE MAP")
+#Check that the vectorized map is bit identical to the one built by the per pixel predicates
+def verifyObstacleMap(obstacleMap)->bool:
+    reference = npObstacleMapPerPixel(np.full(obstacleMap.shape,125,dtype=np.uint8))
+    vectorized = npObstacleMap(np.full(obstacleMap.shape,125,dtype=np.uint8))
+    return np.array_equal(reference,vectorized) and np.array_equal(reference,obstacleMap)
+
+# Configuration space
+# The planner grid is generated from the true obstacle shapes (no hand padding) grown by clearance+robot radius
+# with one euclidean distance transform, so any clearance or robot size can be used without re-deriving geometry
+
+#Mask of the cells inside (or on the edge of) a convex polygon given as [x,y] vertices in order
+def convexPolygonMask(xs,ys,vertices):
+    crosses = []
+    for (x0,y0),(x1,y1) in zip(vertices,vertices[1:]+vertices[:1]):
+        crosses.append((x1-x0)*(ys-y0)-(y1-y0)*(xs-x0))
+    return np.logical_and.reduce([c>=0 for c in crosses]) | np.logical_and.reduce([c<=0 for c in crosses])
+
+#Boolean mask of the true obstacles, without clearance, for map rows y0..y1 given as rows=(y0,y1) and columns x0..x1
+#given as columns, the whole map by default. The obstacles of SCENE when one is configured
+def actualObstacleMask(shape,resolution=None,rows=None,columns=None):
+    resolution = RESOLUTION if resolution is None else resolution
+    if SCENE is not None:
+        return SCENE.mask(shape,resolution,rows,columns)
+    y0,y1 = (0,shape[0]) if rows is None else rows
+    x0,x1 = (0,shape[1]) if columns is None else columns
+    ys,xs = np.mgrid[y0:y1,x0:x1]
+    if resolution != 1:
+        ys,xs = ys*resolution,xs*resolution
+    rectangles = (xs>=100) & (xs<=150) & ((ys<=100) | (ys>=150))
+    return rectangles | convexPolygonMask(xs,ys,hex_actual_vertex) | convexPolygonMask(xs,ys,triangle_actual)
+
+#Rows and columns the robot centre may use for a clearance and robot radius, (range of y, range of x)
+def mapBounds(clearance=None,robotRadius=None,shape=None,resolution=None):
+    clearance = CLEARANCE if clearance is None else clearance
+    robotRadius = ROBOT_RADIUS if robotRadius is None else robotRadius
+    shape = mapShape() if shape is None else shape
+    resolution = RESOLUTION if resolution is None else resolution
+    margin = int(np.ceil((clearance+robotRadius)/resolution))
+    return range(margin,shape[0]-margin),range(margin,shape[1]-margin)
+
+#Euclidean distance (cells) of every cell of the map to the nearest obstacle, None if there are no obstacles
+#It is computed once per map shape and resolution and kept in MAPS, a sweep of robot sizes only thresholds it again
+def obstacleDistance(shape,resolution):
+    key = ("OBSTACLE_DISTANCE",tuple(shape[:2]),resolution)
+    if key not in MAPS:
+        #opencv is only needed here, keep it out of the import of the planner
+        import cv2
+        obstacles = actualObstacleMask(shape,resolution)
+        MAPS[key] = cv2.distanceTransform((~obstacles).astype(np.uint8),cv2.DIST_L2,cv2.DIST_MASK_PRECISE) if obstacles.any() else None
+    return MAPS[key]
+
+#Boolean mask of the cells of map rows y0..y1 (and columns x0..x1 given as columns, all by default) the robot centre may not use
+#A cell is blocked if it is inside an obstacle, closer than clearance+robotRadius to one, or that close to a wall
+#Maps up to DISTANCE_FIELD_CELLS cells share one distance field (obstacleDistance) for every clearance and robot radius.
+#On larger maps the distance transform runs on the rows plus enough rows (and columns) around them to see every obstacle
+#in reach, so the map can be built in bands or tiles and a huge map never needs a full size float image
+#With clearance 5 the rectangles and walls match the hand padded ones, the hexagon and triangle get rounded corners
+def configurationSpaceRows(y0,y1,shape=None,clearance=None,robotRadius=None,resolution=None,columns=None):
+    #opencv is only needed here, keep it out of the import of the planner
+    import cv2
+    clearance = CLEARANCE if clearance is None else clearance
+    robotRadius = ROBOT_RADIUS if robotRadius is None else robotRadius
+    shape = mapShape() if shape is None else shape
+    resolution = RESOLUTION if resolution is None else resolution
+    inflate = (clearance+robotRadius)/resolution
+    reach = int(np.ceil(inflate))+1
+    x0,x1 = (0,shape[1]) if columns is None else columns
+    if inflate > 0 and shape[0]*shape[1] <= DISTANCE_FIELD_CELLS:
+        distance = obstacleDistance(shape,resolution)
+        blocked = np.zeros((y1-y0,x1-x0),dtype=bool) if distance is None else distance[y0:y1,x0:x1] < inflate
+    else:
+        a0,a1 = max(0,y0-reach),min(shape[0],y1+reach)
+        b0,b1 = max(0,x0-reach),min(shape[1],x1+reach)
+        obstacles = actualObstacleMask(shape,resolution,(a0,a1),(b0,b1))
+        if inflate > 0 and obstacles.any():
+            distance = cv2.distanceTransform((~obstacles).astype(np.uint8),cv2.DIST_L2,cv2.DIST_MASK_PRECISE)
+            blocked = distance[y0-a0:y1-a0,x0-b0:x1-b0] < inflate
+        else:
+            blocked = obstacles[y0-a0:y1-a0,x0-b0:x1-b0]
+    ybound,xbound = mapBounds(clearance,robotRadius,shape,resolution)
+    cols = np.arange(x0,x1)
+    blocked[:,(cols<xbound.start)|(cols>=xbound.stop)] = True
+    rows = np.arange(y0,y1)
+    blocked[(rows<ybound.start)|(rows>=ybound.stop)] = True
+    return blocked
+
+#Boolean (rows,columns) mask of the whole configuration space
+def configurationSpace(shape=None,clearance=None,robotRadius=None,resolution=None):
+    shape = mapShape() if shape is None else shape
+    return configurationSpaceRows(0,shape[0],shape,clearance,robotRadius,resolution)
+
+#Occupancy grid used by the planner, OBSTACLE_MAP is only used for rendering
+#One bit per cell (1 == free) instead of 3 bytes per cell, packed row major over a grid
+#padded by PAD blocked cells on every side, so neighbours of any map cell never need a bounds check
+class OccupancyGrid:
+    PAD = 1
+    #The planners call resolve(index) when they read a 0 bit, None means every bit is already known (see LazyOccupancyGrid)
+    resolve = None
+
+    #Constructor Data: boolean (rows,columns) array, True where the robot may stand
+    def __init__(self,free):
+        height,width = free.shape
+        padded = np.zeros((height+2*self.PAD,width+2*self.PAD),dtype=bool)
+        padded[self.PAD:self.PAD+height,self.PAD:self.PAD+width] = free
+        self.attach(np.packbits(padded.ravel()),height,width)
+
+    #Build the grid band by band, freeRows(y0,y1) returns the boolean free mask of map rows y0..y1
+    #Only one band of unpacked cells exists at a time, so this is how large maps are built
+    @classmethod
+    def fromRows(cls,height,width,freeRows,band=256):
+        stride = width+2*cls.PAD
+        rows = height+2*cls.PAD
+        bits = np.zeros((rows*stride+7)//8,dtype=np.uint8)
+        #band is a multiple of 8, so every band starts on a whole byte
+        band = max(8,band//8*8)
+        for p0 in range(0,rows,band):
+            p1 = min(p0+band,rows)
+            padded = np.zeros((p1-p0,stride),dtype=bool)
+            y0,y1 = max(p0-cls.PAD,0),min(p1-cls.PAD,height)
+            if y1 > y0:
+                padded[y0+cls.PAD-p0:y1+cls.PAD-p0,cls.PAD:cls.PAD+width] = freeRows(y0,y1)
+            chunk = np.packbits(padded.ravel())
+            bits[p0*stride//8:p0*stride//8+chunk.size] = chunk
+        return cls.fromBits(bits,height,width)
+
+    #Grid over bits that are already packed, for example a shared memory buffer
+    @classmethod
+    def fromBits(cls,bits,height,width):
+        grid = cls.__new__(cls)
+        grid.attach(bits,height,width)
+        return grid
+
+    def attach(self,bits,height,width):
+        self.HEIGHT,self.WIDTH = height,width
+        self.STRIDE = width+2*self.PAD
+        self.SIZE = (height+2*self.PAD)*self.STRIDE
+        self.bits = bits
+        self.view = memoryview(self.bits)
+        #Bumped on every change so cached results built on an older grid can be detected
+        self.version = 0
+
+    #Flat cell index of (y,x) in the padded grid
+    def index(self,y,x):
+        return int((y+self.PAD)*self.STRIDE+x+self.PAD)
+
+    #(y,x) of a flat cell index
+    def coords(self,index):
+        y,x = divmod(index,self.STRIDE)
+        return (y-self.PAD,x-self.PAD)
+
+    def isFreeIndex(self,index):
+        return (self.view[index>>3]&(128>>(index&7)))!=0
+
+    #(y,x) must be inside the map or its padding, which is always true for neighbours of a map cell
+    def isFree(self,y,x):
+        return self.isFreeIndex(self.index(y,x))
+
+    #cells, a sequence of (y,x), as an (n,2) array, a cell outside the map would write into the padding or past the bits
+    def mapCells(self,cells):
+        cells = np.asarray(cells,dtype=np.int64).reshape(-1,2)
+        outside = ~((cells[:,0]>=0)&(cells[:,0]<self.HEIGHT)&(cells[:,1]>=0)&(cells[:,1]<self.WIDTH))
+        if outside.any():
+            raise ValueError("cell {} is outside the {}x{} map".format(tuple(cells[outside][0].tolist()),self.HEIGHT,self.WIDTH))
+        return cells
+
+    #Mark cells, a sequence of (y,x) inside the map, as free or blocked, nothing is changed if a cell is outside
+    def setFree(self,cells,free:bool):
+        cells = self.mapCells(cells)
+        indices = (cells[:,0]+self.PAD)*self.STRIDE+cells[:,1]+self.PAD
+        masks = (128>>(indices&7)).astype(np.uint8)
+        if free:
+            np.bitwise_or.at(self.bits,indices>>3,masks)
+        else:
+            np.bitwise_and.at(self.bits,indices>>3,~masks)
+        self.version += 1
+
+    #State of the grid to compare with later, changedCells(snapshot) gives the cells changed since
+    def snapshot(self):
+        return self.bits.copy()
+
+    #Flat indices of the cells whose free bit differs from snapshot
+    def changedCells(self,snapshot):
+        return np.flatnonzero(np.unpackbits(snapshot^self.bits,count=self.SIZE))
+
+    #snapshot brought up to date after setFree changed the cells at the flat indices, only their bytes are copied
+    def patchSnapshot(self,snapshot,indices):
+        changedBytes = np.unique(np.asarray(indices,dtype=np.int64)>>3)
+        snapshot[changedBytes] = self.bits[changedBytes]
+        return snapshot
+
+    #Unpacked boolean mask of the free cells of map rows y0..y1 and columns x0..x1, only those rows are unpacked
+    #The bounds may reach one cell into the padding
+    def freeRegion(self,y0,y1,x0,x1):
+        first = (y0+self.PAD)*self.STRIDE
+        last = (y1+self.PAD)*self.STRIDE
+        rows = np.unpackbits(self.bits[first>>3:(last+7)>>3])[first&7:(first&7)+last-first].reshape(-1,self.STRIDE)
+        return rows[:,x0+self.PAD:x1+self.PAD].astype(bool)
+
+    #Unpacked boolean (rows,columns) view of the free cells
+    def freeMask(self):
+        return self.freeRegion(0,self.HEIGHT,0,self.WIDTH)
+
+    @property
+    def nbytes(self):
+        return self.bits.nbytes
+
+#Occupancy grid whose cells are only worked out when a planner first reads them, for short queries on huge maps
+#The bits are kept per TILE x TILE tile, packed row by row, and worked out with regionFree(y0,y1,x0,x1) (the boolean free
+#mask of those rows and columns) the first time a cell of the tile is read. At most MAX_TILES worked out tiles are kept,
+#the least recently read one is dropped and worked out again if it is read later, so the memory is bounded whatever
+#the map size. Tiles changed by setFree are kept as well, they cannot be worked out again.
+#The planners read view like the bits of an OccupancyGrid, here it is all 0 and takes no memory, so every read goes to
+#resolve(index). The same planners run on this grid and on an OccupancyGrid
+class LazyOccupancyGrid(OccupancyGrid):
+    TILE = 64
+    MAX_TILES = 4096
+
+    def __init__(self,height,width,regionFree,tile=None,maxTiles=None):
+        size = (height+2*self.PAD)*(width+2*self.PAD)
+        self.attach(np.broadcast_to(np.uint8(0),((size+7)//8,)),height,width)
+        self.regionFree = regionFree
+        self.TILE = self.TILE if tile is None else tile
+        self.MAX_TILES = self.MAX_TILES if maxTiles is None else maxTiles
+        self.TILES_X = -(-width//self.TILE)
+        self.TILE_BYTES = (self.TILE*self.TILE+7)//8
+        #Worked out tiles by least recently read first, and the tiles changed by setFree
+        self.tiles = OrderedDict()
+        self.edited = {}
+        #Number of times a tile was worked out, a dropped tile read again counts again
+        self.loads = 0
+        #Flat indices changed by every setFree. The snapshots are positions in this log instead of copies of the bits
+        self.edits = []
+
+    #Packed bits of a tile, worked out from regionFree, the cells past the map edge are 0
+    def loadTile(self,tile):
+        ty,tx = divmod(tile,self.TILES_X)
+        y0,x0 = ty*self.TILE,tx*self.TILE
+        y1,x1 = min(y0+self.TILE,self.HEIGHT),min(x0+self.TILE,self.WIDTH)
+        free = np.zeros((self.TILE,self.TILE),dtype=bool)
+        free[:y1-y0,:x1-x0] = self.regionFree(y0,y1,x0,x1)
+        self.loads += 1
+        return bytearray(np.packbits(free).tobytes())
+
+    #Packed bits of a tile, worked out and kept if it is not known, the oldest kept tile is dropped past MAX_TILES
+    def tileBits(self,tile):
+        data = self.tiles.get(tile)
+        if data is not None:
+            self.tiles.move_to_end(tile)
+            return data
+        data = self.edited.get(tile)
+        if data is None:
+            data = self.tiles[tile] = self.loadTile(tile)
+            if len(self.tiles)>self.MAX_TILES:
+                self.tiles.popitem(last=False)
+        return data
+
+    #Tile of a map cell, -1 for the padding
+    def tileOf(self,y,x):
+        if 0<=y<self.HEIGHT and 0<=x<self.WIDTH:
+            return (y//self.TILE)*self.TILES_X+x//self.TILE
+        return -1
+
+    #Every read of a cell ends here, True if the cell is free
+    def resolve(self,index):
+        y,x = divmod(index,self.STRIDE)
+        y,x = y-self.PAD,x-self.PAD
+        if not (0<=y<self.HEIGHT and 0<=x<self.WIDTH):
+            return False
+        tile = self.TILE
+        data = self.tileBits((y//tile)*self.TILES_X+x//tile)
+        bit = (y%tile)*tile+x%tile
+        return (data[bit>>3]&(128>>(bit&7)))!=0
+
+    def isFreeIndex(self,index):
+        return self.resolve(index)
+
+    #Tiles of the map cells of rows y0..y1 and columns x0..x1
+    def tilesOf(self,y0,y1,x0,x1):
+        y0,y1,x0,x1 = max(y0,0),min(y1,self.HEIGHT),max(x0,0),min(x1,self.WIDTH)
+        if y1<=y0 or x1<=x0:
+            return []
+        return [ty*self.TILES_X+tx for ty in range(y0//self.TILE,(y1-1)//self.TILE+1) for tx in range(x0//self.TILE,(x1-1)//self.TILE+1)]
+
+    #Put together from the tiles, the bounds may reach one cell into the padding
+    def freeRegion(self,y0,y1,x0,x1):
+        region = np.zeros((y1-y0,x1-x0),dtype=bool)
+        for tile in self.tilesOf(y0,y1,x0,x1):
+            ty,tx = divmod(tile,self.TILES_X)
+            ty0,tx0 = ty*self.TILE,tx*self.TILE
+            r0,r1 = max(y0,ty0),min(y1,ty0+self.TILE,self.HEIGHT)
+            c0,c1 = max(x0,tx0),min(x1,tx0+self.TILE,self.WIDTH)
+            free = np.unpackbits(np.frombuffer(self.tileBits(tile),dtype=np.uint8)).reshape(self.TILE,self.TILE)
+            region[r0-y0:r1-y0,c0-x0:c1-x0] = free[r0-ty0:r1-ty0,c0-tx0:c1-tx0]
+        return region
+
+    #The tiles of the cells are moved to the edited tiles first, a dropped tile would lose the change
+    def setFree(self,cells,free:bool):
+        cells = self.mapCells(cells)
+        tile = self.TILE
+        changed = []
+        for y,x in cells.tolist():
+            key = (y//tile)*self.TILES_X+x//tile
+            data = self.edited.get(key)
+            if data is None:
+                data = self.tiles.pop(key,None)
+                data = self.edited[key] = self.loadTile(key) if data is None else data
+            bit = (y%tile)*tile+x%tile
+            mask = 128>>(bit&7)
+            if bool(data[bit>>3]&mask)!=free:
+                data[bit>>3] ^= mask
+                changed.append(self.index(y,x))
+        self.edits.append(np.unique(np.array(changed,dtype=np.int64)))
+        self.version += 1
+
+    def snapshot(self):
+        return np.int64(len(self.edits))
+
+    #Cells changed by setFree since the snapshot, a cell changed and changed back is reported as well
+    def changedCells(self,snapshot):
+        edits = self.edits[int(snapshot):]
+        return np.unique(np.concatenate(edits)) if edits else np.zeros(0,dtype=np.int64)
+
+    def patchSnapshot(self,snapshot,indices):
+        return self.snapshot()
+
+    #Bytes of the tiles kept now
+    @property
+    def nbytes(self):
+        return (len(self.tiles)+len(self.edited))*self.TILE_BYTES
+
+#Lazy grid of the configured map, clearance and robot radius: a tile costs the obstacles and distance transform of the
+#tile and the cells in reach around it, instead of the whole map
+def buildLazyOccupancyGrid(clearance=None,robotRadius=None,tile=None,maxTiles=None)->LazyOccupancyGrid:
+    clearance = CLEARANCE if clearance is None else clearance
+    robotRadius = ROBOT_RADIUS if robotRadius is None else robotRadius
+    shape = mapShape()
+    regionFree = lambda y0,y1,x0,x1: ~configurationSpaceRows(y0,y1,shape,clearance,robotRadius,columns=(x0,x1))
+    return LazyOccupancyGrid(shape[0],shape[1],regionFree,tile,maxTiles)
+
+#The maps are built on first use and kept here, OBSTACLE_MAP and OCCUPANCY_GRID are still readable as module attributes
+MAPS = {}
+
+#Rendered obstacle map (rows,columns,3), only used for the visualization
+#The README map is drawn with obstacleMask, the obstacles grown by hand like the original per pixel map (verifyObstacleMap
+#keeps it equal to that map). A scene has no hand grown shapes, its obstacles are drawn as they are and the clearance only
+#shows in the occupancy grid, so a scene of the README obstacles draws them thinner than the README map does
+def getObstacleMap():
+    if "OBSTACLE_MAP" not in MAPS:
+        image = np.full(mapShape(),125,dtype=np.uint8)
+        image[obstacleMask(image.shape,RESOLUTION) if SCENE is None else SCENE.mask(image.shape,RESOLUTION)] = OBSTACLE_COLOR
+        MAPS["OBSTACLE_MAP"] = image
+    return MAPS["OBSTACLE_MAP"]
+
+#Hash of everything the occupancy grid depends on: the obstacle definitions (the rectangle limits live in the
+#source of actualObstacleMask) or the scene, clearance, robot radius, map shape, resolution and grid layout. Any change gives a new cache entry
+def occupancyCacheKey(clearance,robotRadius)->str:
+    sources = [inspect.getsource(function) for function in (convexPolygonMask,actualObstacleMask,mapBounds,configurationSpaceRows)]
+    scene = None if SCENE is None else SCENE.key()
+    return map_cache.cacheKey(sources,hex_actual_vertex,triangle_actual,scene,clearance,robotRadius,mapShape(),RESOLUTION,OccupancyGrid.PAD)
+
+#Occupancy grid for a clearance and robot radius, built band by band
+#The packed bits come from the on disk map cache when possible, copy on write so setFree never touches the cache file
+def buildOccupancyGrid(clearance=None,robotRadius=None)->OccupancyGrid:
+    clearance = CLEARANCE if clearance is None else clearance
+    robotRadius = ROBOT_RADIUS if robotRadius is None else robotRadius
+    shape = mapShape()
+    freeRows = lambda y0,y1: ~configurationSpaceRows(y0,y1,shape,clearance,robotRadius)
+    build = lambda: OccupancyGrid.fromRows(shape[0],shape[1],freeRows).bits
+    bits = map_cache.loadOrBuild("occupancy",occupancyCacheKey(clearance,robotRadius),build)
+    return OccupancyGrid.fromBits(bits,shape[0],shape[1])
+
+#Occupancy grid used by every planner, lazy after configureLazy
+def getOccupancyGrid()->OccupancyGrid:
+    if "OCCUPANCY_GRID" not in MAPS:
+        MAPS["OCCUPANCY_GRID"] = buildLazyOccupancyGrid(**LAZY) if LAZY is not None else buildOccupancyGrid()
+    return MAPS["OCCUPANCY_GRID"]
+
+#Change the clearance and robot radius used by every planner from now on
+def configureRobot(clearance=CLEARANCE,robotRadius=ROBOT_RADIUS):
+    global CLEARANCE,ROBOT_RADIUS
+    CLEARANCE,ROBOT_RADIUS = clearance,robotRadius
+    MAPS.pop("OCCUPANCY_GRID",None)
+    getOccupancyGrid()
+
+#Make every planner use a LazyOccupancyGrid (tile and maxTiles default to its TILE and MAX_TILES) from now on,
+#lazy=False goes back to the grid built up front
+def configureLazy(lazy=True,tile=None,maxTiles=None):
+    global LAZY
+    LAZY = dict(tile=tile,maxTiles=maxTiles) if lazy else None
+    MAPS.pop("OCCUPANCY_GRID",None)
+
+#Change the map size (mm) and resolution (mm per cell) used by every planner and by the rendering from now on
+#The maps are rebuilt on next use, the obstacles keep their position in mm
+def configureMap(height=MAP_HEIGHT,width=MAP_WIDTH,resolution=RESOLUTION):
+    global MAP_HEIGHT,MAP_WIDTH,RESOLUTION
+    MAP_HEIGHT,MAP_WIDTH,RESOLUTION = height,width,resolution
+    MAPS.clear()
+
+#Use the obstacles of a scene.Scene from now on, None goes back to the README obstacles
+#A scene with a size sets the map size as well, the resolution is kept
+def configureScene(scene=None):
+    global SCENE
+    SCENE = scene
+    MAPS.clear()
+    if scene is not None and scene.height is not None:
+        configureMap(scene.height,scene.width,RESOLUTION)
+
+#Map size, resolution, scene, clearance, robot radius and lazy setting, for applySettings in another process
+def mapSettings()->dict:
+    return dict(height=MAP_HEIGHT,width=MAP_WIDTH,resolution=RESOLUTION,scene=SCENE,clearance=CLEARANCE,robotRadius=ROBOT_RADIUS,lazy=LAZY)
+
+#Use the settings of mapSettings(), for workers that start from the defaults (spawn and forkserver)
+#The maps are rebuilt on next use if anything changed
+def applySettings(settings:dict):
+    global MAP_HEIGHT,MAP_WIDTH,RESOLUTION,SCENE,CLEARANCE,ROBOT_RADIUS,LAZY
+    if settings!=mapSettings():
+        MAP_HEIGHT,MAP_WIDTH,RESOLUTION = settings["height"],settings["width"],settings["resolution"]
+        SCENE,CLEARANCE,ROBOT_RADIUS,LAZY = settings["scene"],settings["clearance"],settings["robotRadius"],settings["lazy"]
+        MAPS.clear()
+
+#Prompt coordinates (Y grows upwards) to (row,column) of the map and back, the flip is its own inverse
+def flipY(point,grid:OccupancyGrid=None):
+    grid = getOccupancyGrid() if grid is None else grid
+    return (grid.HEIGHT-1-point[0],point[1])
+
+def __getattr__(name):
+    if name=="OBSTACLE_MAP":
+        return getObstacleMap()
+    if name=="OCCUPANCY_GRID":
+        return getOccupancyGrid()
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__,name))
+
+#Add (blocked=True) or clear obstacles at cells, a sequence of (y,x), in both the planner grid and the rendered map
+#This is the way to change the map, it keeps the two in sync and invalidates cached cost fields
+#A cell outside the map raises ValueError before either is changed
+def updateObstacles(cells,blocked=True):
+    getOccupancyGrid().setFree(cells,not blocked)
+    obstacleMap = getObstacleMap()
+    for y,x in np.asarray(cells).reshape(-1,2):
+        obstacleMap[y,x] = OBSTACLE_COLOR if blocked else 125
+
+#Cell (row,column) inside the bounds and not inside an obstacle
+def isValidCell(point,grid:OccupancyGrid=None)->bool:
+    grid = getOccupancyGrid() if grid is None else grid
+    return 0<=point[0]<grid.HEIGHT and 0<=point[1]<grid.WIDTH and grid.isFree(point[0],point[1])
 #Node data structure
 class GraphNode:
 
@@ -98,11 +591,12 @@ class GraphNode:
         #For each action mentioned in actions, check if a action is valid, and if it is, insert it in the children's list
         newId = int(self.ID)
         newLevel = self.LEVEL+1
+        grid = getOccupancyGrid()
         for [key,value] in ACTIONS.items():
             dy,dx = value
             newy,newx = curr_y+dy,curr_x+dx
-            #TODO(ADD a check for obstacle intersection
-            if((newy in YBOUND) and ( newx in XBOUND)) and (OBSTACLE_MAP[newy][newx][0]!=OBSTACLE_COLOR[0]) and (OBSTACLE_MAP[newy][newx][1]!=OBSTACLE_COLOR[1]) and (OBSTACLE_MAP[newy][newx][2]!=OBSTACLE_COLOR[2]):
+            #Bounds and obstacles are both encoded in the occupancy grid
+            if grid.isFree(newy,newx):
                 newId+=1
                 newCost = self.cost+COSTFORACTION[key]
                 self.children.append(GraphNode((newy,newx),self,newId,newCost,newLevel))
@@ -214,134 +708,887 @@ def backTrack(inputNode:GraphNode):
     print('parent COST:{} ,end COST:{}'.format(path[0].cost,path[-1].cost))
     return path
 
-#Execute Djikstra with debug prints, and save files            
-def dikPrintReversePath(start,end,printPath:bool):
+#Flat index offset, cost and move code of every action in a grid
+#The move code of an action is its position in ACTIONS + 1, see ROOT and CLOSED below
+def neighbourSteps(grid:OccupancyGrid):
+    return [(dy*grid.STRIDE+dx,COSTFORACTION[key],action+1) for action,(key,(dy,dx)) in enumerate(ACTIONS.items())]
+
+#Search state of a cell in the array planners, one byte per cell:
+#the low 4 bits are the move code of the action that reached the cell (0 = not reached yet, ROOT = start of the search)
+#and the CLOSED bit is set once the cell is expanded
+#Together with a float32 cost this is 5 bytes per cell, the arrays are allocated with np.zeros/np.empty which the OS maps lazily,
+#so only the pages of cells a search actually touches take memory
+ROOT = 15
+CLOSED = 16
+
+#Result of the array backed planners
+class SearchResult:
+
+    def __init__(self,path,cost,expanded,costs=None,moves=None,expansionOrder=None,waypoints=None,metrics=None):
+        #List of (y,x) from start to goal, empty if the goal is unreachable
+        self.path = path
+        #Cost of the path, None if the goal is unreachable
+        self.cost = cost
+        #Number of cells taken off the open list
+        self.expanded = expanded
+        #Flat float32 cost and uint8 move/closed state arrays indexed by cell, costs are only meaningful where moves is not 0
+        self.costs = costs
+        self.moves = moves
+        #Flat cell indices in the order they were expanded, only kept if requested
+        self.expansionOrder = expansionOrder
+        #Jump points of the path for planners that skip cells (JPS), None otherwise
+        self.waypoints = waypoints
+        #Counters of the search from heapMetrics, only kept if requested
+        self.metrics = metrics
+
+    def found(self)->bool:
+        return self.cost is not None
+
+#Counters of a heap search with lazy deletion, from values the search keeps anyway: every push was popped (as an
+#expansion or as a stale entry) or is still on the heap, and every push but the first one of each reached cell lowered
+#the cost of a cell already on the heap (a decrease-key). peakFrontier is the largest the open list got
+def heapMetrics(expanded,stalePops,heapLeft,reached,peakFrontier)->dict:
+    pushes = expanded+stalePops+heapLeft
+    return {"expanded":expanded,"pushes":pushes,"decreaseKeys":pushes-int(reached),"stalePops":stalePops,"peakFrontier":peakFrontier}
+
+#Observer of a search, subclasses override the events they need. Events come in batches of flat cell indices
+#(grid.coords turns them into (y,x)), at most BATCH expansions apart, never one call per cell
+class SearchObserver:
+    BATCH = 4096
+    #Relaxations cost the search a list append per push, they are only collected for observers that want them
+    WANTS_RELAX = False
+
+    #int64 array of the cells expanded since the last batch, in order
+    def onExpand(self,cells):
+        pass
+
+    #Cells whose cost was lowered since the last batch, in order, and their new costs (float64 arrays)
+    #A cell lowered twice is in it twice, bidirectional searches report both sides with their own costs
+    def onRelax(self,cells,costs):
+        pass
+
+    #Once, when the search found the goal, with its flat index and the cost of the path
+    #A multi goal search calls it for every goal it settled, nearest first
+    def onGoalReached(self,goal,cost):
+        pass
+
+#Keeps every expanded cell, what recordOrder uses
+class ExpansionRecorder(SearchObserver):
+
+    def __init__(self):
+        self.batches = []
+
+    def onExpand(self,cells):
+        self.batches.append(cells)
+
+    def order(self):
+        return np.concatenate(self.batches) if self.batches else np.zeros(0,dtype=np.int64)
+
+#Forwards the events to several observers
+class ObserverGroup(SearchObserver):
+
+    def __init__(self,observers):
+        self.observers = observers
+        self.WANTS_RELAX = any(observer.WANTS_RELAX for observer in observers)
+        self.BATCH = min(observer.BATCH for observer in observers)
+
+    def onExpand(self,cells):
+        for observer in self.observers:
+            observer.onExpand(cells)
+
+    def onRelax(self,cells,costs):
+        for observer in self.observers:
+            if observer.WANTS_RELAX:
+                observer.onRelax(cells,costs)
+
+    def onGoalReached(self,goal,cost):
+        for observer in self.observers:
+            observer.onGoalReached(goal,cost)
+
+#Collects the events of one search and hands them to the observer in batches
+#The search calls expand(node) from the branch it only enters when observed, and pushes with push: plain heappush
+#unless the observer wants relaxations. Heap entries are (key,h,cell,cost)
+class SearchEvents:
+
+    def __init__(self,observer:SearchObserver):
+        self.observer = observer
+        self.batch = observer.BATCH
+        self.expanded = []
+        self.relaxed = []
+        self.push = self.pushRelaxed if observer.WANTS_RELAX else heappush
+
+    def pushRelaxed(self,heap,entry):
+        self.relaxed.append(entry)
+        heappush(heap,entry)
+
+    def expand(self,node):
+        self.expanded.append(node)
+        if len(self.expanded) >= self.batch:
+            self.flush()
+
+    def flush(self):
+        if self.expanded:
+            self.observer.onExpand(np.array(self.expanded,dtype=np.int64))
+            self.expanded = []
+        if self.relaxed:
+            self.observer.onRelax(np.array([entry[2] for entry in self.relaxed],dtype=np.int64),np.array([entry[3] for entry in self.relaxed]))
+            self.relaxed = []
+
+    def finish(self,goal,cost):
+        self.flush()
+        if cost is not None:
+            self.observer.onGoalReached(goal,cost)
+
+#SearchEvents for the observer of a search, with an ExpansionRecorder added for recordOrder
+#Returns (events,recorder), events is None when nothing observes the search
+def searchEvents(recordOrder,observer:SearchObserver=None):
+    recorder = ExpansionRecorder() if recordOrder else None
+    observers = [item for item in (recorder,observer) if item is not None]
+    if not observers:
+        return None,None
+    return SearchEvents(observers[0] if len(observers)==1 else ObserverGroup(observers)),recorder
+
+#Walk the move codes back from index to the root, returns the list of (y,x) from the root to index
+def backTrackMoves(moves,index,grid:OccupancyGrid):
+    steps = neighbourSteps(grid)
+    path = []
+    while True:
+        path.append(grid.coords(index))
+        move = moves[index]&15
+        if move==ROOT or move==0:
+            break
+        index -= steps[move-1][0]
+    path.reverse()
+    return path
+
+#Octile distance, the exact cost of the cheapest 8 connected move sequence between two cells when there are no obstacles
+#It never overestimates the true cost, so A* with it returns the same path cost as Djikstra
+def octileDistance(dy,dx):
+    dy = abs(dy)
+    dx = abs(dx)
+    if dy > dx:
+        dy,dx = dx,dy
+    return DIAGONAL_COST*dy+SIDEWAY_COST*(dx-dy)
+
+#Array backed best first search, shared by Djikstra and A*
+#Cost and move/closed state live in flat numpy arrays indexed by cell and the open list is a heapq
+#Entries are never removed from the heap, a cell that is popped after being closed is a stale entry and is skipped
+#Heap entries carry the exact (float64) cost of the cell, the float32 costs array is only used to prune worse relaxations
+#With heuristic=True the open list is ordered by cost + octile distance to the goal (A*), ties go to the cell closer to the goal
+#With endGoal=None the search runs until every reachable cell is expanded, this builds a full cost field
+#metrics=True keeps the heapMetrics counters in result.metrics, without it the search pays for one counter of stale pops
+#observer is a SearchObserver, recordOrder records the expansions with an ExpansionRecorder
+def searchArray(startGoal,endGoal,grid:OccupancyGrid=None,heuristic=False,recordOrder=False,metrics=False,observer:SearchObserver=None)->SearchResult:
+    grid = getOccupancyGrid() if grid is None else grid
+    start = grid.index(*startGoal)
+    goal = -1 if endGoal is None else grid.index(*endGoal)
+    heuristic = heuristic and endGoal is not None
+    costs = np.empty(grid.SIZE,dtype=np.float32)
+    moves = np.zeros(grid.SIZE,dtype=np.uint8)
+    #memoryviews give fast scalar access to the numpy buffers from the python loop
+    cost = memoryview(costs)
+    move = memoryview(moves)
+    free = grid.view
+    resolve = grid.resolve
+    steps = neighbourSteps(grid)
+    stride = grid.STRIDE
+    goalY,goalX = divmod(goal,stride)
+    diagonalCost,sideCost = DIAGONAL_COST,SIDEWAY_COST
+    events,recorder = searchEvents(recordOrder,observer)
+    push = heappush if events is None else events.push
+    observe = events is not None or metrics
+    expanded = 0
+    stalePops = 0
+    peakFrontier = lastStale = 0
+    goalCost = None
+    cost[start] = 0.0
+    move[start] = ROOT
+    h = octileDistance(startGoal[0]-endGoal[0],startGoal[1]-endGoal[1]) if heuristic else 0.0
+    heap = [(h,h,start,0.0)]
+    while heap:
+        _,_,node,nodeCost = heappop(heap)
+        state = move[node]
+        if state&CLOSED:
+            stalePops+=1
+            continue
+        move[node] = state|CLOSED
+        expanded+=1
+        if observe:
+            if events is not None:
+                events.expand(node)
+            if metrics:
+                #The open list only grows by the pushes of an expansion, its size after them was the current size
+                #plus this pop and the stale pops since
+                peakFrontier = max(peakFrontier,len(heap)+1+stalePops-lastStale)
+                lastStale = stalePops
+        if node==goal:
+            goalCost = nodeCost
+            break
+        for offset,stepCost,action in steps:
+            child = node+offset
+            state = move[child]
+            #A 0 bit is only looked at again on a lazy grid
+            if state&CLOSED or not free[child>>3]&(128>>(child&7)) and (resolve is None or not resolve(child)):
+                continue
+            newCost = nodeCost+stepCost
+            if state==0 or newCost < cost[child]:
+                cost[child] = newCost
+                move[child] = action
+                if heuristic:
+                    #octileDistance inlined, this is the hot loop
+                    dy,dx = divmod(child,stride)
+                    dy = dy-goalY if dy > goalY else goalY-dy
+                    dx = dx-goalX if dx > goalX else goalX-dx
+                    h = diagonalCost*dx+sideCost*(dy-dx) if dy > dx else diagonalCost*dy+sideCost*(dx-dy)
+                push(heap,(newCost+h,h,child,newCost))
+    if events is not None:
+        events.finish(goal,goalCost)
+    order = None if recorder is None else recorder.order()
+    if metrics:
+        peakFrontier = max(peakFrontier,len(heap)+stalePops-lastStale)
+        metrics = heapMetrics(expanded,stalePops,len(heap),np.count_nonzero(moves),peakFrontier)
+    else:
+        metrics = None
+    if goalCost is None:
+        return SearchResult([],None,expanded,costs,moves,order,metrics=metrics)
+    return SearchResult(backTrackMoves(moves,goal,grid),goalCost,expanded,costs,moves,order,metrics=metrics)
+
+#Cost of a list of (y,x) moves, summed from the start like the planners do
+def pathCost(path):
+    cost = 0.0
+    for (y0,x0),(y1,x1) in zip(path,path[1:]):
+        cost += DIAGONAL_COST if (y0!=y1 and x0!=x1) else SIDEWAY_COST
+    return cost
+
+#Bidirectional version of searchArray, searches forward from the start and backward from the goal at the same time
+#Moves are symmetric, so the backward search runs on the same grid with the same steps
+#Each iteration expands the side with the smaller open list. The best meeting cost is updated every time a side reaches a cell
+#the other side has already reached. The search stops when no unexpanded cell can give a cheaper meeting:
+#  without heuristic: top key forward + top key backward >= best
+#  with heuristic (each side aims at the other end): max(top key forward,top key backward) >= best
+#metrics adds up the counters of both sides, the frontier is both open lists
+def bidirectionalArray(startGoal,endGoal,grid:OccupancyGrid=None,heuristic=False,recordOrder=False,metrics=False,observer:SearchObserver=None)->SearchResult:
+    grid = getOccupancyGrid() if grid is None else grid
+    ends = (grid.index(*startGoal),grid.index(*endGoal))
+    costs = (np.empty(grid.SIZE,dtype=np.float32),np.empty(grid.SIZE,dtype=np.float32))
+    moves = (np.zeros(grid.SIZE,dtype=np.uint8),np.zeros(grid.SIZE,dtype=np.uint8))
+    cost = tuple(memoryview(a) for a in costs)
+    move = tuple(memoryview(a) for a in moves)
+    free = grid.view
+    resolve = grid.resolve
+    steps = neighbourSteps(grid)
+    stride = grid.STRIDE
+    diagonalCost,sideCost = DIAGONAL_COST,SIDEWAY_COST
+    #Each side aims at the other end
+    targets = (divmod(ends[1],stride),divmod(ends[0],stride))
+    events,recorder = searchEvents(recordOrder,observer)
+    push = heappush if events is None else events.push
+    expanded = 0
+    stalePops = 0
+    peakFrontier = 0
+    heaps = ([],[])
+    for side in (0,1):
+        h = octileDistance(startGoal[0]-endGoal[0],startGoal[1]-endGoal[1]) if heuristic else 0.0
+        cost[side][ends[side]] = 0.0
+        move[side][ends[side]] = ROOT
+        heaps[side].append((h,h,ends[side],0.0))
+    best = 0.0 if ends[0]==ends[1] else np.inf
+    meet = ends[0] if ends[0]==ends[1] else -1
+    while True:
+        if metrics:
+            peakFrontier = max(peakFrontier,len(heaps[0])+len(heaps[1]))
+        #Drop stale entries so that the tops of the heaps are the true minimum keys
+        for side in (0,1):
+            heap = heaps[side]
+            while heap and move[side][heap[0][2]]&CLOSED:
+                heappop(heap)
+                stalePops+=1
+        if not heaps[0] or not heaps[1]:
+            break
+        topForward,topBackward = heaps[0][0][0],heaps[1][0][0]
+        if heuristic:
+            if max(topForward,topBackward) >= best:
+                break
+        elif topForward+topBackward >= best:
+            break
+        side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        heap,thisCost,thisMove = heaps[side],cost[side],move[side]
+        otherCost,otherMove = cost[1-side],move[1-side]
+        targetY,targetX = targets[side]
+        _,_,node,nodeCost = heappop(heap)
+        thisMove[node] |= CLOSED
+        expanded+=1
+        if events is not None:
+            events.expand(node)
+        for offset,stepCost,action in steps:
+            child = node+offset
+            state = thisMove[child]
+            if state&CLOSED or not free[child>>3]&(128>>(child&7)) and (resolve is None or not resolve(child)):
+                continue
+            newCost = nodeCost+stepCost
+            if state==0 or newCost < thisCost[child]:
+                thisCost[child] = newCost
+                thisMove[child] = action
+                h = 0.0
+                if heuristic:
+                    dy,dx = divmod(child,stride)
+                    dy = dy-targetY if dy > targetY else targetY-dy
+                    dx = dx-targetX if dx > targetX else targetX-dx
+                    h = diagonalCost*dx+sideCost*(dy-dx) if dy > dx else diagonalCost*dy+sideCost*(dx-dy)
+                push(heap,(newCost+h,h,child,newCost))
+                if otherMove[child] and newCost+otherCost[child] < best:
+                    best = newCost+otherCost[child]
+                    meet = child
+    if meet != -1:
+        #Splice the forward half path (start..meet) and the backward half path (meet..goal)
+        path = backTrackMoves(moves[0],meet,grid)
+        path += reversed(backTrackMoves(moves[1],meet,grid)[:-1])
+    #Observers get the cost of the result, best adds up float32 costs of the two sides
+    if events is not None:
+        events.finish(ends[1],None if meet==-1 else pathCost(path))
+    order = None if recorder is None else recorder.order()
+    if metrics:
+        reached = np.count_nonzero(moves[0])+np.count_nonzero(moves[1])
+        metrics = heapMetrics(expanded,stalePops,len(heaps[0])+len(heaps[1]),reached,peakFrontier)
+    else:
+        metrics = None
+    if meet == -1:
+        return SearchResult([],None,expanded,costs[0],moves[0],order,metrics=metrics)
+    return SearchResult(path,pathCost(path),expanded,costs[0],moves[0],order,metrics=metrics)
+
+def dijkstraArray(startGoal,endGoal,grid:OccupancyGrid=None,recordOrder=False,metrics=False,observer:SearchObserver=None)->SearchResult:
+    return searchArray(startGoal,endGoal,grid,False,recordOrder,metrics,observer)
+
+def astarArray(startGoal,endGoal,grid:OccupancyGrid=None,recordOrder=False,metrics=False,observer:SearchObserver=None)->SearchResult:
+    return searchArray(startGoal,endGoal,grid,True,recordOrder,metrics,observer)
+
+def bidirectionalDijkstraArray(startGoal,endGoal,grid:OccupancyGrid=None,recordOrder=False,metrics=False,observer:SearchObserver=None)->SearchResult:
+    return bidirectionalArray(startGoal,endGoal,grid,False,recordOrder,metrics,observer)
+
+def bidirectionalAstarArray(startGoal,endGoal,grid:OccupancyGrid=None,recordOrder=False,metrics=False,observer:SearchObserver=None)->SearchResult:
+    return bidirectionalArray(startGoal,endGoal,grid,True,recordOrder,metrics,observer)
+
+#One Djikstra run from startGoal to many goals, a list of (y,x) cells, for "path to each of these stations" queries
+#The search stops once every goal is expanded, or the first k of them with k (the k nearest, k=1 is the nearest goal),
+#instead of running once per goal. Goals that are blocked never stop it, goals that are unreachable make it expand
+#every reachable cell. Returns a SearchResult per goal in the order of goals, the ones not settled have no path,
+#expanded, costs, moves and metrics are the ones of the shared search. There is no heuristic, no single goal to aim at
+def multiGoalArray(startGoal,goals,k=None,grid:OccupancyGrid=None,recordOrder=False,metrics=False,observer:SearchObserver=None):
+    grid = getOccupancyGrid() if grid is None else grid
+    start = grid.index(*startGoal)
+    #Flat index of every free goal and the positions it has in goals, a goal can be given twice
+    pending = {}
+    for position,goal in enumerate(goals):
+        index = grid.index(*goal)
+        if grid.isFreeIndex(index):
+            pending.setdefault(index,[]).append(position)
+    target = len(pending) if k is None else min(k,len(pending))
+    costs = np.empty(grid.SIZE,dtype=np.float32)
+    moves = np.zeros(grid.SIZE,dtype=np.uint8)
+    cost = memoryview(costs)
+    move = memoryview(moves)
+    free = grid.view
+    resolve = grid.resolve
+    steps = neighbourSteps(grid)
+    events,recorder = searchEvents(recordOrder,observer)
+    push = heappush if events is None else events.push
+    observe = events is not None or metrics
+    expanded = 0
+    stalePops = 0
+    peakFrontier = lastStale = 0
+    #(index,cost) of the settled goals, nearest first
+    settled = []
+    cost[start] = 0.0
+    move[start] = ROOT
+    heap = [(0.0,0.0,start,0.0)]
+    while heap and len(settled)<target:
+        _,_,node,nodeCost = heappop(heap)
+        state = move[node]
+        if state&CLOSED:
+            stalePops+=1
+            continue
+        move[node] = state|CLOSED
+        expanded+=1
+        if observe:
+            if events is not None:
+                events.expand(node)
+            if metrics:
+                peakFrontier = max(peakFrontier,len(heap)+1+stalePops-lastStale)
+                lastStale = stalePops
+        if node in pending:
+            settled.append((node,nodeCost))
+        for offset,stepCost,action in steps:
+            child = node+offset
+            state = move[child]
+            if state&CLOSED or not free[child>>3]&(128>>(child&7)) and (resolve is None or not resolve(child)):
+                continue
+            newCost = nodeCost+stepCost
+            if state==0 or newCost < cost[child]:
+                cost[child] = newCost
+                move[child] = action
+                push(heap,(newCost,0.0,child,newCost))
+    if events is not None:
+        events.finish(None,None)
+        for goal,goalCost in settled:
+            events.observer.onGoalReached(goal,goalCost)
+    order = None if recorder is None else recorder.order()
+    if metrics:
+        peakFrontier = max(peakFrontier,len(heap)+stalePops-lastStale)
+        metrics = heapMetrics(expanded,stalePops,len(heap),np.count_nonzero(moves),peakFrontier)
+    else:
+        metrics = None
+    results = [SearchResult([],None,expanded,costs,moves,order,metrics=metrics) for _ in goals]
+    for goal,goalCost in settled:
+        path = backTrackMoves(move,goal,grid)
+        for position in pending[goal]:
+            results[position] = SearchResult(list(path),goalCost,expanded,costs,moves,order,metrics=metrics)
+    return results
+
+#Expand a list of jump points into the cells in between, every segment is a straight or diagonal line
+def expandWaypoints(waypoints):
+    if not waypoints:
+        return []
+    path = [waypoints[0]]
+    for (y1,x1) in waypoints[1:]:
+        y,x = path[-1]
+        dy = (y1>y)-(y1<y)
+        dx = (x1>x)-(x1<x)
+        while (y,x) != (y1,x1):
+            y,x = y+dy,x+dx
+            path.append((y,x))
+    return path
+
+#Jump Point Search (A* over jump points) for the 8 connected grid with uniform straight and diagonal costs
+#Diagonal moves are allowed next to obstacles like in generate_children, so the pruning rules are the original ones
+#that allow corner cutting. Only jump points are pushed on the heap and they are few, so cost, parent and closed state are
+#dicts keyed by cell and memory does not grow with the map
+#Observers see the jump points, the cells in between are never expanded
+def jpsArray(startGoal,endGoal,grid:OccupancyGrid=None,recordOrder=False,metrics=False,observer:SearchObserver=None)->SearchResult:
+    grid = getOccupancyGrid() if grid is None else grid
+    start = grid.index(*startGoal)
+    goal = grid.index(*endGoal)
+    cost = {start:0.0}
+    parent = {start:-1}
+    closed = set()
+    bits = grid.view
+    resolve = grid.resolve
+    stride = grid.STRIDE
+    goalY,goalX = divmod(goal,stride)
+
+    def free(index):
+        return bits[index>>3]&(128>>(index&7)) or (resolve is not None and resolve(index))
+
+    #Walk from node in a straight direction d, perpendicular is the flat offset of one cell sideways
+    def jumpStraight(node,d,perpendicular):
+        while True:
+            node+=d
+            if not free(node):
+                return -1
+            if node==goal:
+                return node
+            if (not free(node+perpendicular) and free(node+perpendicular+d)) or (not free(node-perpendicular) and free(node-perpendicular+d)):
+                return node
+
+    #Walk from node diagonally, dx is +-1 and dy is +-stride
+    def jumpDiagonal(node,dy,dx):
+        while True:
+            node+=dy+dx
+            if not free(node):
+                return -1
+            if node==goal:
+                return node
+            if (not free(node-dx) and free(node-dx+dy)) or (not free(node-dy) and free(node-dy+dx)):
+                return node
+            if jumpStraight(node,dx,stride)!=-1 or jumpStraight(node,dy,1)!=-1:
+                return node
+
+    #Directions worth searching from node, pruned by the direction it was reached from
+    def successorDirections(node):
+        if parent[node]==-1:
+            return [(dy*stride,dx) for dy,dx in ACTIONS.values()]
+        nodeY,nodeX = divmod(node,stride)
+        parentY,parentX = divmod(parent[node],stride)
+        dy = ((nodeY>parentY)-(nodeY<parentY))*stride
+        dx = (nodeX>parentX)-(nodeX<parentX)
+        directions = []
+        if dy and dx:
+            directions = [(0,dx),(dy,0),(dy,dx)]
+            if not free(node-dx):
+                directions.append((dy,-dx))
+            if not free(node-dy):
+                directions.append((-dy,dx))
+        elif dx:
+            directions = [(0,dx)]
+            if not free(node+stride):
+                directions.append((stride,dx))
+            if not free(node-stride):
+                directions.append((-stride,dx))
+        else:
+            directions = [(dy,0)]
+            if not free(node+1):
+                directions.append((dy,1))
+            if not free(node-1):
+                directions.append((dy,-1))
+        return directions
+
+    events,recorder = searchEvents(recordOrder,observer)
+    push = heappush if events is None else events.push
+    observe = events is not None or metrics
+    expanded = 0
+    stalePops = 0
+    peakFrontier = lastStale = 0
+    h = octileDistance(startGoal[0]-endGoal[0],startGoal[1]-endGoal[1])
+    heap = [(h,h,start,0.0)]
+    while heap:
+        _,_,node,nodeCost = heappop(heap)
+        if node in closed:
+            stalePops+=1
+            continue
+        closed.add(node)
+        expanded+=1
+        if observe:
+            if events is not None:
+                events.expand(node)
+            if metrics:
+                peakFrontier = max(peakFrontier,len(heap)+1+stalePops-lastStale)
+                lastStale = stalePops
+        if node==goal:
+            break
+        nodeY,nodeX = divmod(node,stride)
+        for dy,dx in successorDirections(node):
+            if dy and dx:
+                jumpPoint = jumpDiagonal(node,dy,dx)
+            else:
+                jumpPoint = jumpStraight(node,dy+dx,1 if dy else stride)
+            if jumpPoint==-1 or jumpPoint in closed:
+                continue
+            jumpY,jumpX = divmod(jumpPoint,stride)
+            newCost = nodeCost+octileDistance(jumpY-nodeY,jumpX-nodeX)
+            if newCost < cost.get(jumpPoint,np.inf):
+                cost[jumpPoint] = newCost
+                parent[jumpPoint] = node
+                h = octileDistance(jumpY-goalY,jumpX-goalX)
+                push(heap,(newCost+h,h,jumpPoint,newCost))
+    if goal in closed:
+        waypoints = []
+        node = goal
+        while node != -1:
+            waypoints.append(grid.coords(node))
+            node = parent[node]
+        waypoints.reverse()
+        path = expandWaypoints(waypoints)
+    #Observers get the cost of the result, the path summed cell by cell
+    if events is not None:
+        events.finish(goal,pathCost(path) if goal in closed else None)
+    order = None if recorder is None else recorder.order()
+    if metrics:
+        peakFrontier = max(peakFrontier,len(heap)+stalePops-lastStale)
+        metrics = heapMetrics(expanded,stalePops,len(heap),len(cost),peakFrontier)
+    else:
+        metrics = None
+    if goal not in closed:
+        return SearchResult([],None,expanded,expansionOrder=order,metrics=metrics)
+    return SearchResult(path,pathCost(path),expanded,expansionOrder=order,waypoints=waypoints,metrics=metrics)
+
+#Hierarchical planner over clusters of the grid, see hpa.py
+#hpa.py imports this module, so it is imported on first use
+def hpaArray(startGoal,endGoal,grid:OccupancyGrid=None,recordOrder=False,metrics=False,observer:SearchObserver=None)->SearchResult:
+    import hpa
+    return hpa.hpaSearch(startGoal,endGoal,grid,recordOrder,metrics=metrics,observer=observer)
+
+#Planning modes selectable by name
+PLANNERS = {"dijkstra":dijkstraArray,"astar":astarArray,"bidirectional":bidirectionalDijkstraArray,"bidirectional-astar":bidirectionalAstarArray,"jps":jpsArray,"hpa":hpaArray}
+
+#Cost to go field of one full Djikstra run from a source
+#Any goal is then answered with an O(path length) walk over the move codes instead of a new search
+#The field keeps the float32 costs and the uint8 move codes of the search, 5 bytes per cell
+class CostField:
+
+    def __init__(self,source,grid:OccupancyGrid=None):
+        grid = getOccupancyGrid() if grid is None else grid
+        result = searchArray(source,None,grid)
+        self.SOURCE = tuple(source)
+        self.grid = grid
+        self.VERSION = grid.version
+        self.EXPANDED = result.expanded
+        self.costs = result.costs
+        self.moves = result.moves
+        self.costs[self.moves==0] = np.inf
+
+    #Field was built on the current version of its grid
+    def isCurrent(self)->bool:
+        return self.VERSION==self.grid.version
+
+    #List of (y,x) from the source to goal, empty if goal is unreachable
+    def path(self,goal):
+        index = self.grid.index(*goal)
+        if self.moves[index]==0:
+            return []
+        return backTrackMoves(memoryview(self.moves),index,self.grid)
+
+    @property
+    def nbytes(self):
+        return self.costs.nbytes+self.moves.nbytes
+
+#LRU cache of cost fields under a memory budget in bytes
+#Fields built on an older version of their grid are dropped when the grid is queried again
+class CostFieldCache:
+
+    def __init__(self,budget=64*2**20):
+        self.budget = budget
+        self.fields = OrderedDict()
+
+    def get(self,source,grid:OccupancyGrid=None)->CostField:
+        grid = getOccupancyGrid() if grid is None else grid
+        self.dropStale(grid)
+        key = (id(grid),tuple(source))
+        field = self.fields.get(key)
+        if field is not None and field.grid is grid:
+            self.fields.move_to_end(key)
+            return field
+        field = CostField(source,grid)
+        self.fields[key] = field
+        #Always keep the newest field, even if it alone is over the budget
+        while len(self.fields)>1 and self.nbytes>self.budget:
+            self.fields.popitem(last=False)
+        return field
+
+    def dropStale(self,grid:OccupancyGrid):
+        for key in [key for key,field in self.fields.items() if field.grid is grid and not field.isCurrent()]:
+            del self.fields[key]
+
+    def clear(self):
+        self.fields.clear()
+
+    @property
+    def nbytes(self):
+        return sum(field.nbytes for field in self.fields.values())
+
+COST_FIELD_CACHE = CostFieldCache()
+
+#Plan from a source (a dock for example) to goal through the cached cost field of source
+#The first query from a source runs one full Djikstra, every later goal is a parent walk
+#A source or goal outside the map or inside an obstacle gives an empty result and builds no field
+def planFromSource(source,goal,grid:OccupancyGrid=None,cache:CostFieldCache=None)->SearchResult:
+    grid = getOccupancyGrid() if grid is None else grid
+    if not isValidCell(source,grid) or not isValidCell(goal,grid):
+        return SearchResult([],None,0)
+    cache = COST_FIELD_CACHE if cache is None else cache
+    field = cache.get(source,grid)
+    path = field.path(goal)
+    if not path:
+        return SearchResult([],None,0)
+    return SearchResult(path,pathCost(path),0)
+
+#Expansions of a planning mode next to plain Djikstra for the same query, returns (djikstra,mode,saved)
+#result is the SearchResult of the mode when it is already known, then only the Djikstra baseline is run
+def expansionSavings(startGoal,endGoal,mode,grid:OccupancyGrid=None,result:SearchResult=None):
+    baseline = dijkstraArray(startGoal,endGoal,grid).expanded
+    expanded = (PLANNERS[mode](startGoal,endGoal,grid) if result is None else result).expanded
+    return baseline,expanded,baseline-expanded
+
+#Worker side of planBatch, the grid is a view of the shared memory block set up by batchWorkerInit
+BATCH_SHM = None
+BATCH_GRID = None
+
+def batchWorkerInit(name,height,width):
+    global BATCH_SHM,BATCH_GRID
+    BATCH_SHM = shared_memory.SharedMemory(name=name)
+    size = (height+2*OccupancyGrid.PAD)*(width+2*OccupancyGrid.PAD)
+    bits = np.ndarray(((size+7)//8,),dtype=np.uint8,buffer=BATCH_SHM.buf)
+    BATCH_GRID = OccupancyGrid.fromBits(bits,height,width)
+
+def batchWorkerPlan(query):
+    mode,start,goal = query
+    result = PLANNERS[mode](start,goal,BATCH_GRID)
+    return result.path,result.cost,result.expanded
+
+#Plan many (start,goal) pairs of (row,column) cells over a pool of processes
+#The occupancy grid is copied once into shared memory and every worker maps it instead of receiving a pickled copy
+#Returns a (path,cost,expanded) tuple per pair, in the order of pairs. processes=None uses every core
+#Pairs with a start or goal outside the map or inside an obstacle are not searched, they get ([],None,0) like plan()
+def planBatch(pairs,mode="dijkstra",processes=None,grid:OccupancyGrid=None):
+    grid = getOccupancyGrid() if grid is None else grid
+    results = [([],None,0) for _ in pairs]
+    positions = [position for position,(start,goal) in enumerate(pairs) if isValidCell(start,grid) and isValidCell(goal,grid)]
+    queries = [(mode,tuple(pairs[position][0]),tuple(pairs[position][1])) for position in positions]
+    for position,result in zip(positions,planQueries(queries,processes,grid)):
+        results[position] = result
+    return results
+
+#(path,cost,expanded) of every (mode,start,goal) query, the cells are already checked
+def planQueries(queries,processes,grid:OccupancyGrid):
+    processes = os.cpu_count() if processes is None else processes
+    #Workers map the bits, the tiles of a lazy grid would never be worked out there
+    if processes<=1 or len(queries)<=1 or grid.resolve is not None:
+        results = []
+        for query in queries:
+            result = PLANNERS[query[0]](query[1],query[2],grid)
+            results.append((result.path,result.cost,result.expanded))
+        return results
+    shm = shared_memory.SharedMemory(create=True,size=grid.bits.nbytes)
+    try:
+        np.ndarray(grid.bits.shape,dtype=np.uint8,buffer=shm.buf)[:] = grid.bits
+        chunksize = max(1,len(queries)//(processes*4))
+        with Pool(processes,batchWorkerInit,(shm.name,grid.HEIGHT,grid.WIDTH)) as pool:
+            return pool.map(batchWorkerPlan,queries,chunksize)
+    finally:
+        shm.close()
+        shm.unlink()
+
+#Read (start,goal) pairs from a text file, one "startY startX endY endX" per line, commas allowed, # starts a comment
+#Coordinates are the ones typed at the prompt (Y grows upwards), the returned pairs are (row,column) cells
+def readPairs(path,grid:OccupancyGrid=None):
+    pairs = []
+    with open(path) as file:
+        for line in file:
+            line = line.split('#')[0].replace(',',' ').split()
+            if not line:
+                continue
+            startY,startX,endY,endX = (int(value) for value in line)
+            pairs.append((flipY((startY,startX),grid),flipY((endY,endX),grid)))
+    return pairs
+
+#Convert an array search result to GraphNodes for the visualization
+#The ID of every node is the rank at which its cell was expanded
+#Path cells that were never expanded themselves (JPS, meeting cell of a bidirectional search) take the rank of the cell before them
+def toGraphNodes(result:SearchResult,grid:OccupancyGrid=None):
+    grid = getOccupancyGrid() if grid is None else grid
+    visited = [GraphNode(grid.coords(int(index)),None,rank) for rank,index in enumerate(result.expansionOrder)]
+    rankOf = {node.DATA:node.ID for node in visited}
+    path = []
+    parent = None
+    rank = 0
+    for data in result.path:
+        rank = rankOf.get(data,rank)
+        cost = 0.0 if parent is None else parent.cost+pathCost([parent.DATA,data])
+        node = GraphNode(data,parent,rank,cost)
+        path.append(node)
+        parent = node
+    return path,visited
+
+#Frame boundaries of a recorded expansion order for the visualization, one frame per path cell:
+#frame k shows the cells expansionOrder[:ends[k]], everything expanded up to the k-th path cell
+#Path cells that were never expanded themselves (JPS, meeting cell of a bidirectional search) and path cells expanded before
+#the one in front of them (backward half of a bidirectional search) keep the boundary of the frame before, so frames only grow
+def expansionFrames(result:SearchResult,grid:OccupancyGrid=None):
+    grid = getOccupancyGrid() if grid is None else grid
+    order = result.expansionOrder
+    path = np.array([grid.index(y,x) for y,x in result.path],dtype=np.int64)
+    if len(order)==0 or len(path)==0:
+        return np.zeros(len(path),dtype=np.int64)
+    #Rank of every path cell in the order, the first one if a cell was expanded twice, -1 if it was not expanded
+    sorter = np.argsort(order,kind="stable")
+    positions = np.minimum(np.searchsorted(order,path,sorter=sorter),len(order)-1)
+    ranks = np.where(order[sorter[positions]]==path,sorter[positions],-1)
+    return np.maximum.accumulate(ranks)+1
+
+#Plan from start to goal, both (row,column) cells, with one of the PLANNERS
+#Returns a SearchResult, with an empty path and cost None if there is no path or an end point is not a valid cell
+#metrics=True keeps the search counters in result.metrics, observer (a SearchObserver) gets the events of the search
+def plan(start,goal,mode="dijkstra",grid:OccupancyGrid=None,metrics=False,observer:SearchObserver=None)->SearchResult:
+    grid = getOccupancyGrid() if grid is None else grid
+    if not isValidCell(start,grid) or not isValidCell(goal,grid):
+        return SearchResult([],None,0)
+    return PLANNERS[mode](tuple(start),tuple(goal),grid,metrics=metrics,observer=observer)
+
+#Paths from start to each of goals (or to the k nearest of them) in one search, see multiGoalArray
+#Returns a SearchResult per goal, in the order of goals
+def planGoals(start,goals,k=None,grid:OccupancyGrid=None,metrics=False,observer:SearchObserver=None):
+    grid = getOccupancyGrid() if grid is None else grid
+    if not isValidCell(start,grid):
+        return [SearchResult([],None,0) for _ in goals]
+    #Goals outside the map have no cell index, they keep an empty result
+    inside = [position for position,goal in enumerate(goals) if 0<=goal[0]<grid.HEIGHT and 0<=goal[1]<grid.WIDTH]
+    found = multiGoalArray(tuple(start),[tuple(goals[position]) for position in inside],k,grid,metrics=metrics,observer=observer)
+    results = [SearchResult([],None,0) for _ in goals]
+    for position,result in zip(inside,found):
+        results[position] = result
+    return results
+
+#Seconds of the phases of a query, and with traceMemory the peak traced memory of each phase in bytes
+#lap(name) ends the phase that started at the previous lap. Without traceMemory it only reads the clock
+class PhaseTimer:
+
+    def __init__(self,traceMemory=False):
+        self.phases = {}
+        self.memory = {} if traceMemory else None
+        #Tracing started by somebody else is left running
+        self.stopTracing = traceMemory and not tracemalloc.is_tracing()
+        if self.stopTracing:
+            tracemalloc.start()
+        elif traceMemory:
+            tracemalloc.reset_peak()
+        self.last = time.perf_counter()
+
+    def lap(self,name):
+        now = time.perf_counter()
+        self.phases[name] = self.phases.get(name,0.0)+now-self.last
+        if self.memory is not None:
+            self.memory[name] = max(self.memory.get(name,0),tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        self.last = time.perf_counter()
+
+    #The time since the last lap belongs to no phase, the next phase starts now
+    def skip(self):
+        if self.memory is not None:
+            tracemalloc.reset_peak()
+        self.last = time.perf_counter()
+
+    def stop(self):
+        if self.stopTracing:
+            tracemalloc.stop()
+            self.stopTracing = False
+
+#JSON ready record of one query: the query and its outcome, the counters of result.metrics (None if they were not kept)
+#and the phases of timer
+def queryMetrics(start,goal,mode,result:SearchResult,timer:PhaseTimer=None)->dict:
+    return {"start":[int(v) for v in start],"goal":[int(v) for v in goal],"mode":mode,"found":result.found(),"cost":result.cost,
+            "steps":max(len(result.path)-1,0),"expanded":result.expanded,"search":result.metrics,
+            "phases":{} if timer is None else dict(timer.phases),"memory":None if timer is None else timer.memory}
+
+#Execute Djikstra with debug prints, returns the SearchResult with its expansion order, None if there is no path
+#compare=True also runs Djikstra on the query to print the expansions the mode saved, it costs a full Djikstra search
+def dikPrintResult(start,end,printPath:bool,mode="dijkstra",metrics=False,compare=False)->SearchResult:
+    result = PLANNERS[mode](start,end,recordOrder=True,metrics=metrics)
+    return printSearchResult(start,end,result,printPath,mode,compare)
+
+#Debug prints of a search result of mode from start to end, returns the result or None if it found no path
+#Kept apart from the search so callers can time the planner alone
+def printSearchResult(start,end,result:SearchResult,printPath:bool,mode="dijkstra",compare=False)->SearchResult:
     start2 = copy.deepcopy(start)
     end2 = copy.deepcopy(end)
-    start2=(249-start2[0],start2[1])
-    end2=(249-end2[0],end2[1])
+    start2=flipY(start2)
+    end2=flipY(end2)
     print('START:\r\n{}'.format(start2))
     print('Expected END:\r\n{}'.format(end2))
-    result,visitedNodes = dikstra(start,end)
-    if result is None:
+    print('\r\nEXPANDED NODE COUNTS:{}'.format(result.expanded))
+    if compare and mode != "dijkstra":
+        baseline,_,saved = expansionSavings(start,end,mode,result=result)
+        print('EXPANSIONS SAVED VS DJIKSTRA:{} ({} expanded by djikstra)'.format(saved,baseline))
+    if not result.found():
         print("Unable to find result")
-        return
+        return None
     print('\r\nFOUND A SOLUTION \r\n')
-    res = copy.deepcopy(result.DATA)
-    res= (249-res[0],res[1])
+    res = copy.deepcopy(result.path[-1])
+    res= flipY(res)
     print('Result:\r\n{}'.format(res))
-    back = backTrack(result)
-    print('\r\nSTEPS:\r\n{}'.format(len(back)-1))
+    print('parent COST:{} ,end COST:{}'.format(0.0,result.cost))
+    print('\r\nSTEPS:\r\n{}'.format(len(result.path)-1))
     if printPath:
         print("PATH :")
-        for i in back:
-            print(i.DATA)
-    return back,visitedNodes
-
-#find visitedNotesAtEachInstanceOfSolutionPath
-def findVisitedNotesPerFrame(path,visited:OrderedSet):
-    visitedNodesPerFrame = []
-    for point in path:
-        visited_array=[]
-        for node in visited:
-            if (node.ID <= point.ID):
-                visited_array.append(node.DATA)
-        visitedNodesPerFrame.append(visited_array)
-    return visitedNodesPerFrame
-
-# Visualize Path and obstacles
-def vizPath(empty_images,path):
-    obstacle_color = (255,0,0)
-    empty_images2 = np.full((len(empty_images)+5,250,600,3),125,dtype=np.uint8)
-    #make the background common
-    for idx,image in enumerate(empty_images2):
-        empty_images2[idx] = empty_images[-1]
-    #draw the path
-    #for this, find path
-    path_pts = []
-    #find path
-    for idx,node in enumerate(path):
-        path_pts.append(node.DATA)
-    # For image in empty_images2 , draw path
-    # Marks path
-    for image in empty_images2:
-        for data in path_pts:
-            y,x = data
-            image =cv2.circle(image, (x,y), 1, (0,0,255),1)
-    empty_images = np.concatenate((empty_images,empty_images2),axis=0)
-    for idx,image in enumerate(empty_images):
-        #Rectangle 1:
-        empty_images[idx] = cv2.rectangle(empty_images[idx], (99,0) , (149,99), obstacle_color ,  -1)
-        #Rectangle 2:
-        empty_images[idx] = cv2.rectangle(empty_images[idx], (99,149) , (149,249), obstacle_color ,  -1)
-        #Triangle 1:
-        triangle_corners = [(460-1, int(25-1)), (460-1, int(225-1)), (int(510-1), 125-1)]
-        empty_images[idx] = cv2.fillPoly(empty_images[idx], np.array([triangle_corners]), obstacle_color)
-        #Hexagon 1:
-        hex_corners = [(235-1, 163-1),(300-1,200-1),(365-1,163-1),(365-1,88-1),(300-1,50-1),(235-1,88-1)]
-        empty_images[idx] = cv2.fillPoly(empty_images[idx], np.array([hex_corners]), obstacle_color)
-    for idx,node in enumerate(path):
-        y,x = node.DATA
-        #Mark Node position by a circle
-        empty_images[idx+5+len(path)] = cv2.circle(empty_images[idx+5+len(path)], (x,y), 4, (0,0,255),-1)
-    return empty_images
-
-#Explored color == GREEN
-def vizExplore(visitedNodesPerFrame,path):
-    empty_images = np.full((len(path),250,600,3),125,dtype=np.uint8)
-    for frame,nodes in zip(empty_images,visitedNodesPerFrame):
-        for node in nodes:
-            y,x = node
-            frame[y][x] = [0,255,0]
-    for idx,frame in enumerate(empty_images,1):
-        color = np.array([0, 255, 0])
-        indices = np.where(np.all(empty_images[idx-1] == color, axis=-1))
-        frame[y,x] = [0,255,0]
-    return empty_images
-
-## Runs everything, saves a video
-def djikstraViz(start,end,input_num=0):
-    if start[0] not in YBOUND or start[1] not in XBOUND:
-        print("START point outside of bounds")
-        return
-    if end[0] not in YBOUND or end[1] not in XBOUND:
-        print("END point outside of bounds")
-        return
-    if np.array_equal(OBSTACLE_MAP[start[0],start[1]],np.array(OBSTACLE_COLOR)) or np.array_equal(OBSTACLE_MAP[end[0],end[1]],np.array(OBSTACLE_COLOR)):
-        print("START OR GOAL POINT INSIDE OBSTACLE SPACE")
-        return
-    before  = time.time()
-    path,visitedNodes = dikPrintReversePath(start,end,False)
-    print("\r\nTIME FOR DJIKSTRA SOLN:{}".format(time.time()-before))
-    if path is None or visitedNodes is None:
-        print("\r\n NO OUTPUT GENERATED \r\n")
-        return 
-    print("\r\n STARTED VISUALIZATION \r\n")
-    before  = time.time()
-    visitedNodesPerFrame = findVisitedNotesPerFrame(path,visitedNodes)
-    assert len(visitedNodesPerFrame) == len(path)
-    viz = vizExplore(visitedNodesPerFrame,path)
-    pathViz = vizPath(viz,path)
-
-    size = (pathViz[0].shape[1],pathViz[0].shape[0])
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    voObj = cv2.VideoWriter('./viz/PathViz'+str(input_num)+'.mp4',fourcc, 15,size)
-    
-    for frame in tqdm(pathViz):
-        image = frame
-        voObj.write(image)
-    voObj.release()
-    print("\r\nTIME FOR VISUALIZATION OUTPUT SOLN:{}".format(time.time()-before))
-    print("\r\nFINISHED GENERATING OUTPUT VIDEO at ./viz/ \r\n")
-    return
-
-while True:
-    startY = int(input('Start Point Y(Row) coordinate:'))
-    startX = int(input('Start Point X(Column) coordinate:'))
-    endY = int(input('End Point Y(Row) coordinate:'))
-    endX = int(input('End Point X(Column) coordinate:'))
-    #Invert axis
-    startY = 249 - startY
-    endY = 249 - endY
-    break
-djikstraViz((startY,startX),(endY,endX))
\ No newline at end of file
+        for i in result.path:
+            print(i)
+    return result
+
+#Execute Djikstra with debug prints, returns the path and visited cells as GraphNodes like the original solver
+def dikPrintReversePath(start,end,printPath:bool,mode="dijkstra"):
+    result = dikPrintResult(start,end,printPath,mode)
+    if result is None:
+        return None,None
+    return toGraphNodes(result)
+
+#Running this file is the same as running dijkstra_cli.py
+if __name__ == "__main__":
+    from dijkstra_cli import main
+    main()
@@ -0,0 +1,130 @@
+#Command line interface of the planner
+#python3 dijkstra_cli.py                                  prompts for the points like the original script
+#python3 dijkstra_cli.py --start 6 6 --goal 120 594       plans one query and saves the video
+#python3 dijkstra_cli.py --batch pairs.txt --processes 4  plans every pair of a file, prints CSV
+#python3 dijkstra_cli.py --start 6 6 --goals 120 594 80 80 plans to every goal in one search, prints CSV
+#Coordinates are (Y,X) with Y growing upwards, like the prompts
+#Imports
+import argparse
+import json
+import sys
+import time
+import dijkstra_Vedant_Ranade as planner
+
+def promptQuery():
+    startY = int(input('Start Point Y(Row) coordinate:'))
+    startX = int(input('Start Point X(Column) coordinate:'))
+    endY = int(input('End Point Y(Row) coordinate:'))
+    endX = int(input('End Point X(Column) coordinate:'))
+    mode = input('Planner {} [dijkstra]:'.format('/'.join(planner.PLANNERS))).strip() or "dijkstra"
+    return (startY,startX),(endY,endX),mode
+
+def runBatch(path,mode,processes):
+    pairs = planner.readPairs(path)
+    before = time.time()
+    results = planner.planBatch(pairs,mode,processes)
+    print("startY,startX,endY,endX,cost,expanded,steps")
+    for (start,end),(path,cost,expanded) in zip(pairs,results):
+        start,end = planner.flipY(start),planner.flipY(end)
+        print("{},{},{},{},{},{},{}".format(start[0],start[1],end[0],end[1],"" if cost is None else round(cost,3),expanded,max(len(path)-1,0)))
+    print("\r\nTIME FOR {} QUERIES:{}".format(len(pairs),time.time()-before),file=sys.stderr)
+
+#Paths from start to every goal, or the nearest k, in one search, printed as CSV in the order of the goals
+def runGoals(start,goals,k=None):
+    before = time.time()
+    results = planner.planGoals(planner.flipY(start),[planner.flipY(goal) for goal in goals],k)
+    print("endY,endX,cost,steps")
+    for goal,result in zip(goals,results):
+        print("{},{},{},{}".format(goal[0],goal[1],"" if result.cost is None else round(result.cost,3),max(len(result.path)-1,0)))
+    print("\r\nEXPANDED:{} TIME:{}".format(max(result.expanded for result in results) if results else 0,time.time()-before),file=sys.stderr)
+
+#Append a metrics record as one line of JSON to path, "-" prints it
+def saveMetrics(record,path):
+    line = json.dumps(record)
+    if path=="-":
+        print(line)
+        return
+    with open(path,"a") as file:
+        file.write(line+"\n")
+
+def runQuery(start,end,mode,video,input_num,frames=None,duration=None,fps=15,spacing="linear",queueFrames=4,processes=1,metricsFile=None,traceMemory=False,compare=False):
+    if video:
+        #Rendering needs opencv, only import it when a video is asked for
+        from visualization import djikstraViz
+        record = djikstraViz(planner.flipY(start),planner.flipY(end),input_num,mode,frames,duration,fps,spacing,queueFrames,processes,metricsFile is not None,traceMemory,compare)
+        if record is not None:
+            saveMetrics(record,metricsFile)
+        return
+    if not planner.isValidCell(planner.flipY(start)) or not planner.isValidCell(planner.flipY(end)):
+        print("START OR GOAL POINT OUTSIDE OF BOUNDS OR INSIDE OBSTACLE SPACE")
+        return
+    before = time.time()
+    timer = planner.PhaseTimer(traceMemory) if metricsFile is not None else None
+    result = planner.plan(planner.flipY(start),planner.flipY(end),mode,metrics=metricsFile is not None)
+    if timer is not None:
+        timer.lap("search")
+        timer.stop()
+        saveMetrics(planner.queryMetrics(planner.flipY(start),planner.flipY(end),mode,result,timer),metricsFile)
+    if not result.found():
+        print("NO PATH FROM {} TO {}".format(start,end))
+        return
+    print("COST:{} EXPANDED:{} STEPS:{} TIME:{}".format(round(result.cost,3),result.expanded,len(result.path)-1,time.time()-before))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Plan paths on the project map, prompts for the points when none are given")
+    parser.add_argument("--start",nargs=2,type=int,metavar=("Y","X"))
+    parser.add_argument("--goal",nargs=2,type=int,metavar=("Y","X"))
+    parser.add_argument("--mode",default="dijkstra",choices=list(planner.PLANNERS))
+    parser.add_argument("--batch",metavar="FILE",help="file with one 'startY startX endY endX' per line")
+    parser.add_argument("--goals",nargs="+",type=int,metavar="Y X",help="plan from --start to every one of these goals in one search, no video")
+    parser.add_argument("--nearest",type=int,metavar="K",help="with --goals, stop at the K nearest goals")
+    parser.add_argument("--processes",type=int,default=None,help="worker processes for --batch, default every core")
+    parser.add_argument("--no-video",action="store_true",help="only print the result of --start/--goal")
+    parser.add_argument("--output-num",type=int,default=0,help="video is saved as ./viz/PathViz<num>.mp4")
+    parser.add_argument("--frames",type=int,default=None,help="video length in frames, default one per path cell")
+    parser.add_argument("--duration",type=float,default=None,help="video length in seconds at --fps, instead of --frames")
+    parser.add_argument("--fps",type=int,default=15)
+    parser.add_argument("--spacing",default="linear",choices=["linear","log"],help="sampling of the exploration for --frames/--duration")
+    parser.add_argument("--encode-queue",type=int,default=4,help="frames between the renderer and the video writer thread (at most 64 MB of them), 0 encodes in one thread")
+    parser.add_argument("--encode-processes",type=int,default=1,help="encode the video as segments in parallel, joined with ffmpeg")
+    parser.add_argument("--metrics",metavar="FILE",help="append a JSON record of every query (search counters, phase timings, start and goal as row,column cells) to FILE, - prints it")
+    parser.add_argument("--compare-dijkstra",action="store_true",help="also run Djikstra on the query and print the expansions the mode saved")
+    parser.add_argument("--trace-memory",action="store_true",help="with --metrics, also record the peak traced memory of every phase (tracing slows the query down several times)")
+    parser.add_argument("--clearance",type=float,default=planner.CLEARANCE,help="free space kept around obstacles and walls")
+    parser.add_argument("--robot-radius",type=float,default=planner.ROBOT_RADIUS)
+    parser.add_argument("--scene",metavar="FILE",help="JSON obstacle scene to use instead of the README obstacles, see scene.py")
+    parser.add_argument("--map-size",nargs=2,type=float,metavar=("HEIGHT","WIDTH"),help="map size in mm, default the size of the scene or 250 600")
+    parser.add_argument("--resolution",type=float,default=planner.RESOLUTION,help="mm per cell")
+    parser.add_argument("--lazy",action="store_true",help="work out the occupancy of a tile of the map the first time a planner reads it, for short queries on huge maps")
+    args = parser.parse_args(argv)
+    if args.scene:
+        import scene
+        planner.configureScene(scene.loadScene(args.scene))
+    height,width = (planner.MAP_HEIGHT,planner.MAP_WIDTH) if args.map_size is None else args.map_size
+    if (height,width,args.resolution) != (planner.MAP_HEIGHT,planner.MAP_WIDTH,planner.RESOLUTION):
+        planner.configureMap(height,width,args.resolution)
+    if args.lazy:
+        planner.configureLazy()
+    if (args.clearance,args.robot_radius) != (planner.CLEARANCE,planner.ROBOT_RADIUS):
+        planner.configureRobot(args.clearance,args.robot_radius)
+    if args.batch:
+        runBatch(args.batch,args.mode,args.processes)
+        return
+    if args.goals is not None:
+        if args.start is None or len(args.goals)%2:
+            parser.error("--goals needs --start and Y X pairs")
+        runGoals(tuple(args.start),list(zip(args.goals[::2],args.goals[1::2])),args.nearest)
+        return
+    if (args.start is None) != (args.goal is None):
+        parser.error("--start and --goal go together")
+    if args.start is None:
+        start,end,mode = promptQuery()
+        if mode not in planner.PLANNERS:
+            print("UNKNOWN PLANNER, choose one of {}".format(list(planner.PLANNERS)))
+            return
+        runQuery(start,end,mode,True,args.output_num,args.frames,args.duration,args.fps,args.spacing,args.encode_queue,args.encode_processes,args.metrics,args.trace_memory,args.compare_dijkstra)
+        return
+    runQuery(tuple(args.start),tuple(args.goal),args.mode,not args.no_video,args.output_num,args.frames,args.duration,args.fps,args.spacing,args.encode_queue,args.encode_processes,args.metrics,args.trace_memory,args.compare_dijkstra)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+#Incremental replanning (D* Lite) over the occupancy grid of dijkstra_Vedant_Ranade.py
+#The search runs backward from the goal and keeps its state between calls. g is the cost to the goal a cell had when it was
+#last expanded, rhs the cost its neighbours give it now. A change of the grid only makes the cells next to the changed cells
+#inconsistent (g != rhs), and only those and the cells whose cost to the goal really changes are expanded again,
+#so replanning costs grow with the size of the change and not with the size of the map
+#The robot may move along the path between replans, the key modifier km keeps the old keys of the open list valid
+#g and rhs are dicts, memory grows with the cells the searches touched
+#Imports
+#Libraries
+import numpy as np
+#Inbuilt modules
+from heapq import heappush,heappop
+#Project modules
+import dijkstra_Vedant_Ranade as planner
+from dijkstra_Vedant_Ranade import OccupancyGrid,SearchResult,neighbourSteps,octileDistance,pathCost
+
+INF = float("inf")
+
+class DStarLite:
+
+    #start and goal are (row,column) cells, the planner follows changes made to grid by updateCells or anybody else
+    #Raises ValueError if start or goal is outside the map or inside an obstacle
+    def __init__(self,start,goal,grid:OccupancyGrid=None):
+        grid = planner.getOccupancyGrid() if grid is None else grid
+        self.grid = grid
+        self.steps = [(offset,cost) for offset,cost,_ in neighbourSteps(grid)]
+        self.start = self.checkedIndex(start,"start")
+        self.goal = self.checkedIndex(goal,"goal")
+        self.km = 0.0
+        self.g = {}
+        self.rhs = {self.goal:0.0}
+        #Open list, a heapq with lazy deletion: open holds the current key of every cell on the list,
+        #heap entries whose key is not the current one are stale and skipped
+        self.open = {}
+        self.heap = []
+        #The grid as it was at the last replan, to find changes not made through updateCells
+        self.snapshot = grid.snapshot()
+        self.VERSION = grid.version
+        #Cells expanded by the last plan() and over the life of the planner
+        self.expanded = 0
+        self.totalExpanded = 0
+        self.push(self.goal)
+
+    def free(self,index):
+        return self.grid.view[index>>3]&(128>>(index&7)) or (self.grid.resolve is not None and self.grid.resolve(index))
+
+    #Octile distance from the current start, the heuristic of the backward search
+    def heuristic(self,index):
+        y,x = divmod(index,self.grid.STRIDE)
+        startY,startX = divmod(self.start,self.grid.STRIDE)
+        return octileDistance(y-startY,x-startX)
+
+    #Cells along a straight line toward the start have equal first keys, summed in a different order they can be one ulp
+    #apart and the second key would no longer break the tie, so the first key is rounded
+    def key(self,index):
+        best = min(self.g.get(index,INF),self.rhs.get(index,INF))
+        return (round(best+self.heuristic(index)+self.km,9),best)
+
+    def push(self,index):
+        key = self.key(index)
+        self.open[index] = key
+        heappush(self.heap,(key[0],key[1],index))
+
+    #Recompute rhs of a cell from its neighbours and put it on the open list if it is inconsistent
+    def updateVertex(self,index):
+        if index!=self.goal:
+            best = INF
+            if self.free(index):
+                g = self.g
+                for offset,cost in self.steps:
+                    neighbour = index+offset
+                    if self.free(neighbour):
+                        candidate = g.get(neighbour,INF)+cost
+                        if candidate < best:
+                            best = candidate
+            self.rhs[index] = best
+        if self.g.get(index,INF)!=self.rhs.get(index,INF):
+            self.push(index)
+        else:
+            self.open.pop(index,None)
+
+    #Smallest key on the open list, stale heap entries on top are dropped
+    def topKey(self):
+        heap,open = self.heap,self.open
+        while heap:
+            k1,k2,index = heap[0]
+            if open.get(index)==(k1,k2):
+                return (k1,k2)
+            heappop(heap)
+        return (INF,INF)
+
+    #g of a cell is its true cost to the goal: it is consistent and no open cell can lower it
+    #It also leaves a valid entry on top of the heap, computeShortestPath relies on that
+    def isSettled(self,index):
+        top = self.topKey()
+        return self.g.get(index,INF)==self.rhs.get(index,INF) and top >= self.key(index)
+
+    #Expand inconsistent cells until target (the start by default) is settled
+    def computeShortestPath(self,target=None):
+        target = self.start if target is None else target
+        g,rhs,heap,open = self.g,self.rhs,self.heap,self.open
+        expanded = 0
+        while not self.isSettled(target):
+            k1,k2,index = heappop(heap)
+            newKey = self.key(index)
+            if (k1,k2) < newKey:
+                open[index] = newKey
+                heappush(heap,(newKey[0],newKey[1],index))
+                continue
+            expanded+=1
+            if g.get(index,INF) > rhs.get(index,INF):
+                g[index] = rhs[index]
+                del open[index]
+            else:
+                g[index] = INF
+                self.updateVertex(index)
+            for offset,_ in self.steps:
+                neighbour = index+offset
+                if self.free(neighbour):
+                    self.updateVertex(neighbour)
+        self.expanded += expanded
+        self.totalExpanded += expanded
+        return expanded
+
+    #Edge costs around every changed cell (flat index) are different now
+    def cellsChanged(self,changed):
+        for index in changed:
+            self.updateVertex(index)
+            for offset,_ in self.steps:
+                self.updateVertex(index+offset)
+
+    #Pick up changes made to the grid since the last replan
+    def sync(self):
+        if self.grid.version!=self.VERSION:
+            self.cellsChanged(self.grid.changedCells(self.snapshot).tolist())
+            self.snapshot = self.grid.snapshot()
+            self.VERSION = self.grid.version
+
+    #Flat index of a cell, a cell outside the map would wrap through the flat index to another cell
+    #With needFree=False a blocked cell is accepted, only the bounds are checked
+    def checkedIndex(self,cell,name,needFree=True):
+        grid = self.grid
+        if not (0<=cell[0]<grid.HEIGHT and 0<=cell[1]<grid.WIDTH):
+            raise ValueError("{} {} is outside the map".format(name,tuple(cell)))
+        if needFree and not grid.isFree(cell[0],cell[1]):
+            raise ValueError("{} {} is inside an obstacle".format(name,tuple(cell)))
+        return grid.index(*cell)
+
+    #The robot moved to cell, plan() now answers from there. Raises ValueError for a cell outside the map or blocked
+    def moveTo(self,cell):
+        index = self.checkedIndex(cell,"cell")
+        self.km += self.heuristic(index)
+        self.start = index
+
+    #Mark cells, a sequence of (y,x), as blocked (or free) and replan
+    #Only the changed cells are looked at, the snapshot is patched byte by byte instead of copied
+    #Raises ValueError before anything is changed if a cell is outside the map, freeing it would open the padding
+    def updateCells(self,cells,blocked=True)->SearchResult:
+        self.sync()
+        grid = self.grid
+        cells = np.asarray(cells,dtype=np.int64).reshape(-1,2)
+        indices = [self.checkedIndex(cell,"cell",needFree=False) for cell in cells.tolist()]
+        changed = [index for index in indices if bool(self.free(index))==blocked]
+        grid.setFree(cells,not blocked)
+        if changed:
+            self.snapshot = grid.patchSnapshot(self.snapshot,changed)
+            self.cellsChanged(changed)
+        self.VERSION = grid.version
+        return self.plan()
+
+    #Repair the search after any grid changes and return the path from the current start
+    #expanded is the number of cells this call expanded
+    def plan(self)->SearchResult:
+        self.expanded = 0
+        self.sync()
+        self.computeShortestPath()
+        if self.g.get(self.start,INF)==INF:
+            return SearchResult([],None,self.expanded)
+        grid = self.grid
+        index = self.start
+        path = [grid.coords(index)]
+        #Every step goes to a neighbour whose cost to the goal plus the step is the cost of the cell. Only the start is settled
+        #by computeShortestPath, cells further along may still have an old g, so if the best neighbour is not settled or
+        #does not give the cost of the cell, the neighbours are settled and the choice is made again
+        while index!=self.goal:
+            best,bestIndex = INF,-1
+            for offset,cost in self.steps:
+                neighbour = index+offset
+                if self.free(neighbour):
+                    candidate = self.g.get(neighbour,INF)+cost
+                    if candidate < best:
+                        best,bestIndex = candidate,neighbour
+            if abs(best-self.g[index]) > 1e-9 or not self.isSettled(bestIndex):
+                for offset,_ in self.steps:
+                    if self.free(index+offset):
+                        self.computeShortestPath(index+offset)
+                continue
+            index = bestIndex
+            path.append(grid.coords(index))
+        return SearchResult(path,pathCost(path),self.expanded)
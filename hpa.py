@@ -0,0 +1,341 @@
+#Hierarchical path planning (HPA*) over the occupancy grid of dijkstra_Vedant_Ranade.py
+#The grid is cut into square clusters. Where two neighbouring clusters touch, every run of free cells on both sides of the
+#border gets entrances, pairs of cells joined by a single move. Inside each cluster the cost between every pair of its
+#entrances is found once with a Djikstra restricted to the cluster. A query only searches this small abstract graph and then
+#refines every edge inside a cluster into cells with an A* restricted to that cluster
+#Paths are not always optimal because they have to go through the entrances. On 300 random queries of the README map the
+#median path is 2% longer than the optimal one, 1 in 20 is more than 8% longer and the worst seen was 29% longer, these are
+#short paths that detour through an entrance. HPA_BOUND is that worst case, there is no guaranteed bound
+#Imports
+#Libraries
+import numpy as np
+#Inbuilt modules
+from heapq import heappush,heappop
+import inspect
+import sys
+import weakref
+#Project modules
+import map_cache
+import dijkstra_Vedant_Ranade as planner
+from dijkstra_Vedant_Ranade import OccupancyGrid,SearchResult,searchArray,octileDistance,pathCost,DIAGONAL_COST,SIDEWAY_COST
+
+CLUSTER_SIZE = 32 # cells per side of a cluster
+HPA_BOUND = 1.3 # Worst measured path cost over the optimal one, see above
+LONG_RUN = 6 # runs of free border cells at least this long get an entrance at each end instead of one in the middle
+
+#(start,end) of every run of True in a boolean array
+def runs(mask):
+    edges = np.diff(np.concatenate(([0],mask.astype(np.int8),[0])))
+    return zip(np.flatnonzero(edges==1),np.flatnonzero(edges==-1))
+
+#Abstract graph of a grid, nodes are flat cell indices of the grid
+#transitions: moves between two neighbouring clusters, keyed by the (lower,higher) cluster pair
+#intra: per cluster, cost between its entrances when the path stays inside the cluster
+#inter: transitions by node, derived from transitions
+class ClusterGraph:
+
+    def __init__(self,grid:OccupancyGrid,clusterSize=CLUSTER_SIZE):
+        #A proxy, CLUSTER_GRAPHS keeps the graph only as long as the grid is alive
+        self.grid = weakref.proxy(grid)
+        self.CLUSTER_SIZE = clusterSize
+        self.ROWS = -(-grid.HEIGHT//clusterSize)
+        self.COLUMNS = -(-grid.WIDTH//clusterSize)
+        self.transitions = {}
+        self.intra = {}
+        self.inter = {}
+        #The abstraction depends on the free cells only, so its key is a checksum of the grid and it is shared by equal grids
+        #A lazy grid only keeps some of its tiles, there are no bits to checksum, so it is read cluster by cluster instead
+        if grid.resolve is not None:
+            self.readEdges(self.buildEdges())
+        else:
+            key = map_cache.cacheKey(inspect.getsource(ClusterGraph),clusterSize,grid.HEIGHT,grid.WIDTH,grid.PAD,map_cache.checksum(grid.bits))
+            self.readEdges(map_cache.loadOrBuild("hpa",key,self.buildEdges))
+        #The grid as it was at the last build, compared with the grid to find the clusters that changed
+        self.snapshot = grid.snapshot()
+        self.VERSION = grid.version
+
+    #Cluster of a flat cell index
+    def clusterOf(self,node):
+        y,x = self.grid.coords(node)
+        return (y//self.CLUSTER_SIZE)*self.COLUMNS+x//self.CLUSTER_SIZE
+
+    #Map rows y0..y1 and columns x0..x1 of a cluster
+    def clusterBounds(self,cluster):
+        clusterY,clusterX = divmod(cluster,self.COLUMNS)
+        y0,x0 = clusterY*self.CLUSTER_SIZE,clusterX*self.CLUSTER_SIZE
+        return y0,min(y0+self.CLUSTER_SIZE,self.grid.HEIGHT),x0,min(x0+self.CLUSTER_SIZE,self.grid.WIDTH)
+
+    #Grid of the cells of one cluster, everything around it blocked, and the (y,x) of its first cell
+    def clusterGrid(self,cluster):
+        y0,y1,x0,x1 = self.clusterBounds(cluster)
+        return OccupancyGrid(self.grid.freeRegion(y0,y1,x0,x1)),y0,x0
+
+    #Clusters around cluster, the 8 neighbours that exist
+    def neighbourClusters(self,cluster):
+        clusterY,clusterX = divmod(cluster,self.COLUMNS)
+        return [(clusterY+dy)*self.COLUMNS+clusterX+dx for dy in (-1,0,1) for dx in (-1,0,1)
+                if (dy or dx) and 0<=clusterY+dy<self.ROWS and 0<=clusterX+dx<self.COLUMNS]
+
+    #Moves (a,b,cost) from cluster lower to its neighbour higher, lower < higher so higher is right, below, below right or below left
+    #Every run of cells free on both sides of a shared border gives the straight moves at its ends, or in its middle if it is short
+    #A diagonal move whose two side cells are blocked is the only way through that corner, so it is kept as a move of its own
+    #Every other diagonal move across a border can be replaced by two moves through a run
+    def findTransitions(self,lower,higher):
+        grid = self.grid
+        y0,y1,x0,x1 = self.clusterBounds(lower)
+        dy = higher//self.COLUMNS-lower//self.COLUMNS
+        dx = higher%self.COLUMNS-lower%self.COLUMNS
+        if dy and dx:
+            #Corner of the clusters, only a diagonal squeeze can cross it
+            x = x1 if dx>0 else x0
+            corner = grid.freeRegion(y1-1,y1+1,x-1,x+1)
+            if dx>0 and corner[0,0] and corner[1,1] and not corner[0,1] and not corner[1,0]:
+                return [(grid.index(y1-1,x1-1),grid.index(y1,x1),DIAGONAL_COST)]
+            if dx<0 and corner[0,1] and corner[1,0] and not corner[0,0] and not corner[1,1]:
+                return [(grid.index(y1-1,x0),grid.index(y1,x0-1),DIAGONAL_COST)]
+            return []
+        #The two lines of cells along the border as (along border,side), and the (y,x) of position i on each side
+        if dx:
+            lines = grid.freeRegion(y0,y1,x1-1,x1+1)
+            cell = lambda i,side: (y0+i,x1-1+side)
+        else:
+            lines = grid.freeRegion(y1-1,y1+1,x0,x1).T
+            cell = lambda i,side: (y1-1+side,x0+i)
+        a,b = lines[:,0],lines[:,1]
+        moves = []
+        for start,end in runs(a&b):
+            positions = (start,end-1) if end-start>=LONG_RUN else ((start+end-1)//2,)
+            for i in positions:
+                moves.append((grid.index(*cell(i,0)),grid.index(*cell(i,1)),SIDEWAY_COST))
+        for i in np.flatnonzero(a[:-1]&b[1:]&~a[1:]&~b[:-1]):
+            moves.append((grid.index(*cell(i,0)),grid.index(*cell(i+1,1)),DIAGONAL_COST))
+        for i in np.flatnonzero(a[1:]&b[:-1]&~a[:-1]&~b[1:]):
+            moves.append((grid.index(*cell(i+1,0)),grid.index(*cell(i,1)),DIAGONAL_COST))
+        return moves
+
+    #Sorted entrance cells of a cluster, the ends of its transitions
+    def entrances(self,cluster):
+        nodes = set()
+        for neighbour in self.neighbourClusters(cluster):
+            for a,b,_ in self.transitions.get((min(cluster,neighbour),max(cluster,neighbour)),()):
+                nodes.add(a if cluster<neighbour else b)
+        return sorted(nodes)
+
+    #Cost between every pair of entrances of a cluster, one Djikstra sweep of the cluster per entrance
+    def buildIntra(self,cluster):
+        sub,y0,x0 = self.clusterGrid(cluster)
+        nodes = self.entrances(cluster)
+        edges = {node:[] for node in nodes}
+        local = [sub.index(y-y0,x-x0) for y,x in map(self.grid.coords,nodes)]
+        for i,node in enumerate(nodes[:-1]):
+            y,x = self.grid.coords(node)
+            result = searchArray((y-y0,x-x0),None,sub)
+            for other,index in zip(nodes[i+1:],local[i+1:]):
+                if result.moves[index]:
+                    cost = float(result.costs[index])
+                    edges[node].append((other,cost))
+                    edges[other].append((node,cost))
+        self.intra[cluster] = edges
+
+    #Rebuild inter from transitions
+    def linkTransitions(self):
+        self.inter = {}
+        for moves in self.transitions.values():
+            for a,b,cost in moves:
+                self.inter.setdefault(a,[]).append((b,cost))
+                self.inter.setdefault(b,[]).append((a,cost))
+
+    #Build the whole abstraction, returns it as the rows of readEdges
+    def buildEdges(self):
+        for lower in range(self.ROWS*self.COLUMNS):
+            for higher in self.neighbourClusters(lower):
+                if higher>lower:
+                    self.transitions[(lower,higher)] = self.findTransitions(lower,higher)
+        for cluster in range(self.ROWS*self.COLUMNS):
+            self.buildIntra(cluster)
+        rows = [(a,b,cost,0) for moves in self.transitions.values() for a,b,cost in moves]
+        rows += [(a,b,cost,1) for edges in self.intra.values() for a,others in edges.items() for b,cost in others if a<b]
+        return np.array(rows,dtype=np.float64).reshape(-1,4)
+
+    #Fill the abstraction from (a,b,cost,kind) rows, kind 0 is a transition and 1 an edge inside a cluster
+    def readEdges(self,rows):
+        self.transitions = {}
+        self.intra = {cluster:{} for cluster in range(self.ROWS*self.COLUMNS)}
+        for a,b,cost,kind in rows.tolist():
+            a,b = int(a),int(b)
+            lower,higher = self.clusterOf(a),self.clusterOf(b)
+            if kind==0:
+                self.transitions.setdefault((lower,higher),[]).append((a,b,cost))
+            else:
+                edges = self.intra[lower]
+                edges.setdefault(a,[]).append((b,cost))
+                edges.setdefault(b,[]).append((a,cost))
+        self.linkTransitions()
+
+    #Bring the abstraction up to date with the grid, only clusters with changed cells and clusters whose entrances moved
+    #because of them are searched again. Returns the clusters that were rebuilt
+    def update(self):
+        grid = self.grid
+        if grid.version==self.VERSION:
+            return []
+        #setFree only takes map cells, so the padding never changes
+        ys,xs = np.divmod(grid.changedCells(self.snapshot),grid.STRIDE)
+        ys,xs = ys-grid.PAD,xs-grid.PAD
+        dirty = set(((ys//self.CLUSTER_SIZE)*self.COLUMNS+xs//self.CLUSTER_SIZE).tolist())
+        around = dirty.union(*(self.neighbourClusters(cluster) for cluster in dirty))
+        before = {cluster:self.entrances(cluster) for cluster in around}
+        for cluster in dirty:
+            for neighbour in self.neighbourClusters(cluster):
+                lower,higher = min(cluster,neighbour),max(cluster,neighbour)
+                self.transitions[(lower,higher)] = self.findTransitions(lower,higher)
+        rebuilt = sorted(cluster for cluster in around if cluster in dirty or self.entrances(cluster)!=before[cluster])
+        for cluster in rebuilt:
+            self.buildIntra(cluster)
+        self.linkTransitions()
+        self.snapshot = grid.snapshot()
+        self.VERSION = grid.version
+        return rebuilt
+
+    #Abstract neighbours of a node as (node,cost)
+    def neighbours(self,node):
+        return self.intra[self.clusterOf(node)].get(node,[])+self.inter.get(node,[])
+
+    #Cost from a cell to the entrances of its cluster, as {entrance:cost}, and the sweep that found it
+    def connect(self,cell):
+        cluster = self.clusterOf(self.grid.index(*cell))
+        sub,y0,x0 = self.clusterGrid(cluster)
+        result = searchArray((cell[0]-y0,cell[1]-x0),None,sub)
+        costs = {}
+        for node in self.entrances(cluster):
+            y,x = self.grid.coords(node)
+            index = sub.index(y-y0,x-x0)
+            if result.moves[index]:
+                costs[node] = float(result.costs[index])
+        return costs,result
+
+    #Bytes of the grid snapshot and of the edge tables with the tuples and numbers in them
+    @property
+    def nbytes(self):
+        size = self.snapshot.nbytes
+        for table in (self.transitions,self.inter,*self.intra.values()):
+            size += sys.getsizeof(table)
+            for edges in table.values():
+                size += sys.getsizeof(edges)+sum(sys.getsizeof(edge)+sum(map(sys.getsizeof,edge)) for edge in edges)
+        return size+sys.getsizeof(self.intra)
+
+#Abstractions by grid and cluster size, dropped with their grid and updated when it changes
+CLUSTER_GRAPHS = weakref.WeakKeyDictionary()
+
+def getClusterGraph(grid:OccupancyGrid=None,clusterSize=CLUSTER_SIZE)->ClusterGraph:
+    grid = planner.getOccupancyGrid() if grid is None else grid
+    graphs = CLUSTER_GRAPHS.setdefault(grid,{})
+    graph = graphs.get(clusterSize)
+    if graph is None:
+        graph = graphs[clusterSize] = ClusterGraph(grid,clusterSize)
+    else:
+        graph.update()
+    return graph
+
+#HPA* from startGoal to endGoal, both (row,column) cells
+#The start and goal are joined to the entrances of their clusters by a sweep of each cluster, the abstract graph is
+#searched with A* and every step inside a cluster is refined with A* restricted to that cluster
+#When start and goal are in the same or neighbouring clusters, an A* over just those clusters gives a direct edge as well,
+#so short paths are not forced through the entrances
+#expanded counts abstract nodes plus the cells expanded by the sweeps and refinements
+#waypoints are the abstract nodes of the path, expansionOrder the abstract nodes in the order they were expanded
+#metrics are the counters of the abstract search, with its expansions only, observer sees the abstract nodes as well
+def hpaSearch(startGoal,endGoal,grid:OccupancyGrid=None,recordOrder=False,clusterSize=CLUSTER_SIZE,metrics=False,observer=None)->SearchResult:
+    grid = planner.getOccupancyGrid() if grid is None else grid
+    graph = getClusterGraph(grid,clusterSize)
+    start = grid.index(*startGoal)
+    goal = grid.index(*endGoal)
+    startCosts,startSweep = graph.connect(startGoal)
+    goalCosts,goalSweep = graph.connect(endGoal)
+    expanded = startSweep.expanded+goalSweep.expanded
+    extra = {start:list(startCosts.items())}
+    for node,cost in goalCosts.items():
+        extra.setdefault(node,[]).append((goal,cost))
+    direct = None
+    startClusterY,startClusterX = divmod(graph.clusterOf(start),graph.COLUMNS)
+    goalClusterY,goalClusterX = divmod(graph.clusterOf(goal),graph.COLUMNS)
+    if abs(startClusterY-goalClusterY)<=1 and abs(startClusterX-goalClusterX)<=1:
+        y0,y1 = min(startClusterY,goalClusterY)*clusterSize,min((max(startClusterY,goalClusterY)+1)*clusterSize,grid.HEIGHT)
+        x0,x1 = min(startClusterX,goalClusterX)*clusterSize,min((max(startClusterX,goalClusterX)+1)*clusterSize,grid.WIDTH)
+        direct = searchArray((startGoal[0]-y0,startGoal[1]-x0),(endGoal[0]-y0,endGoal[1]-x0),OccupancyGrid(grid.freeRegion(y0,y1,x0,x1)),True)
+        expanded += direct.expanded
+        if direct.found():
+            direct.path = [(y+y0,x+x0) for y,x in direct.path]
+            extra[start].append((goal,direct.cost))
+    stride = grid.STRIDE
+    goalY,goalX = divmod(goal,stride)
+    cost = {start:0.0}
+    parent = {start:-1}
+    closed = set()
+    events,recorder = planner.searchEvents(recordOrder,observer)
+    push = heappush if events is None else events.push
+    abstractExpanded = expanded
+    stalePops = 0
+    peakFrontier = lastStale = 0
+    h = octileDistance(startGoal[0]-endGoal[0],startGoal[1]-endGoal[1])
+    heap = [(h,h,start,0.0)]
+    while heap:
+        _,_,node,nodeCost = heappop(heap)
+        if node in closed:
+            stalePops+=1
+            continue
+        closed.add(node)
+        expanded+=1
+        if events is not None:
+            events.expand(node)
+        if metrics:
+            peakFrontier = max(peakFrontier,len(heap)+1+stalePops-lastStale)
+            lastStale = stalePops
+        if node==goal:
+            break
+        for other,edgeCost in graph.neighbours(node)+extra.get(node,[]):
+            newCost = nodeCost+edgeCost
+            if other not in closed and newCost < cost.get(other,np.inf):
+                cost[other] = newCost
+                parent[other] = node
+                otherY,otherX = divmod(other,stride)
+                h = octileDistance(otherY-goalY,otherX-goalX)
+                push(heap,(newCost+h,h,other,newCost))
+    if metrics:
+        peakFrontier = max(peakFrontier,len(heap)+stalePops-lastStale)
+        metrics = planner.heapMetrics(expanded-abstractExpanded,stalePops,len(heap),len(cost),peakFrontier)
+    else:
+        metrics = None
+    if goal not in closed:
+        if events is not None:
+            events.finish(goal,None)
+        order = None if recorder is None else recorder.order()
+        return SearchResult([],None,expanded,expansionOrder=order,metrics=metrics)
+    nodes = []
+    node = goal
+    while node != -1:
+        nodes.append(node)
+        node = parent[node]
+    nodes.reverse()
+    #The direct edge is the whole path
+    if nodes==[start,goal] and direct is not None and direct.found() and cost[goal]==direct.cost:
+        path = direct.path
+        waypoints = [startGoal,endGoal]
+    else:
+        #Refine, a step between clusters is a single move, a step inside a cluster is an A* in that cluster
+        path = [grid.coords(start)]
+        for a,b in zip(nodes,nodes[1:]):
+            cluster = graph.clusterOf(a)
+            if cluster!=graph.clusterOf(b):
+                path.append(grid.coords(b))
+                continue
+            sub,y0,x0 = graph.clusterGrid(cluster)
+            (ay,ax),(by,bx) = grid.coords(a),grid.coords(b)
+            result = searchArray((ay-y0,ax-x0),(by-y0,bx-x0),sub,True)
+            expanded += result.expanded
+            path += [(y+y0,x+x0) for y,x in result.path[1:]]
+        waypoints = [grid.coords(node) for node in nodes]
+    #Observers get the cost of the refined path, the one of the result, not the cost of the abstract path
+    if events is not None:
+        events.finish(goal,pathCost(path))
+    order = None if recorder is None else recorder.order()
+    return SearchResult(path,pathCost(path),expanded,expansionOrder=order,waypoints=waypoints,metrics=metrics)
@@ -0,0 +1,74 @@
+#On disk cache of generated maps
+#Every entry is a .npy file loaded with mmap_mode, so warm starts only map the file and parallel workers share its pages through the OS
+#A .json file next to it stores the key, shape, dtype and crc32 of the data. An entry whose key does not match (stale)
+#or whose data does not match its metadata (corrupt, half written) is rebuilt
+#Imports
+import numpy as np
+#Inbuilt modules
+import hashlib
+import json
+import os
+import zlib
+
+#Set PLANNER_CACHE_DIR to move the cache, PLANNER_CACHE=0 to disable it
+CACHE_DIR = os.environ.get("PLANNER_CACHE_DIR",os.path.join(os.path.dirname(os.path.abspath(__file__)),".map_cache"))
+CACHE_ENABLED = os.environ.get("PLANNER_CACHE","1")!="0"
+
+#Hex digest of the repr of everything an entry depends on
+def cacheKey(*parts)->str:
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+def entryPaths(name,key,directory):
+    base = os.path.join(directory,"{}-{}".format(name,key[:16]))
+    return base+".npy",base+".json"
+
+def checksum(array)->int:
+    return zlib.crc32(np.ascontiguousarray(array).view(np.uint8).ravel())
+
+#Memory mapped array of an entry, None if it is missing, stale or corrupt
+#mmapMode "c" is copy on write: pages stay shared until the process writes to them, and writes never reach the file
+def load(name,key,directory=None,mmapMode="c"):
+    directory = CACHE_DIR if directory is None else directory
+    dataPath,metaPath = entryPaths(name,key,directory)
+    try:
+        with open(metaPath) as file:
+            meta = json.load(file)
+        if meta["key"]!=key:
+            return None
+        array = np.load(dataPath,mmap_mode=mmapMode,allow_pickle=False)
+        if list(array.shape)!=meta["shape"] or str(array.dtype)!=meta["dtype"] or checksum(array)!=meta["crc32"]:
+            return None
+        return array
+    except (OSError,ValueError,KeyError,TypeError):
+        return None
+
+#Write an entry, data first and metadata last, both through a temporary file and an atomic rename
+#so a crash never leaves metadata that describes a partial data file
+def save(name,key,array,directory=None):
+    directory = CACHE_DIR if directory is None else directory
+    dataPath,metaPath = entryPaths(name,key,directory)
+    os.makedirs(directory,exist_ok=True)
+    suffix = ".{}.tmp".format(os.getpid())
+    with open(dataPath+suffix,"wb") as file:
+        np.save(file,array,allow_pickle=False)
+    os.replace(dataPath+suffix,dataPath)
+    meta = {"key":key,"shape":list(array.shape),"dtype":str(array.dtype),"crc32":checksum(array)}
+    with open(metaPath+suffix,"w") as file:
+        json.dump(meta,file)
+    os.replace(metaPath+suffix,metaPath)
+
+#Cached array for key, build() is only called when there is no valid entry
+#If the cache cannot be written the freshly built array is returned as it is
+def loadOrBuild(name,key,build,directory=None,mmapMode="c"):
+    if not CACHE_ENABLED:
+        return build()
+    array = load(name,key,directory,mmapMode)
+    if array is not None:
+        return array
+    array = build()
+    try:
+        save(name,key,array,directory)
+    except OSError:
+        return array
+    cached = load(name,key,directory,mmapMode)
+    return array if cached is None else cached
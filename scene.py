@@ -0,0 +1,187 @@
+#Obstacle scenes loaded from JSON, for maps with thousands of obstacles
+#A scene file is
+#  {"height":250,"width":600,"obstacles":[{"rectangle":[x0,y0,x1,y1]},{"polygon":[[x,y],...]},{"circle":[x,y,r]}]}
+#in mm, height and width are optional. Polygons must be convex (split concave ones), every shape includes its edges
+#planner.configureScene(scene) makes the planner, the occupancy cache and the video use the scene instead of the README obstacles
+#The obstacles are kept in a uniform grid of buckets, every bucket lists the obstacles whose bounding box touches it,
+#so rasterizing a band of the map or testing a point only looks at the obstacles near it, and every obstacle is only
+#rasterized inside its own bounding box. Building the map costs the area of the obstacles, not pixels x obstacles
+#Imports
+#Libraries
+import numpy as np
+#Inbuilt modules
+import hashlib
+import json
+#Project modules
+from dijkstra_Vedant_Ranade import convexPolygonMask
+
+KINDS = ("rectangle","polygon","circle")
+
+#Mask of the points (xs,ys) in mm inside one obstacle
+def shapeMask(kind,shape,xs,ys):
+    if kind=="rectangle":
+        x0,y0,x1,y1 = shape
+        return (xs>=x0) & (xs<=x1) & (ys>=y0) & (ys<=y1)
+    if kind=="circle":
+        x,y,r = shape
+        return (xs-x)**2+(ys-y)**2 <= r*r
+    return convexPolygonMask(xs,ys,shape)
+
+#(x0,y0,x1,y1) bounding box of one obstacle in mm
+def boundingBox(kind,shape):
+    if kind=="rectangle":
+        return tuple(shape)
+    if kind=="circle":
+        x,y,r = shape
+        return (x-r,y-r,x+r,y+r)
+    xs,ys = zip(*shape)
+    return (min(xs),min(ys),max(xs),max(ys))
+
+def isConvex(vertices):
+    crosses = []
+    for (x0,y0),(x1,y1),(x2,y2) in zip(vertices,vertices[1:]+vertices[:1],vertices[2:]+vertices[:2]):
+        crosses.append((x1-x0)*(y2-y1)-(y1-y0)*(x2-x1))
+    return all(c>=0 for c in crosses) or all(c<=0 for c in crosses)
+
+class Scene:
+
+    #obstacles is a list of (kind,shape): ("rectangle",(x0,y0,x1,y1)), ("polygon",[(x,y),...]) or ("circle",(x,y,r)) in mm
+    #height and width of the map in mm, None keeps the configured map size. bucket is the side of a bucket in mm,
+    #by default about the size of an average obstacle
+    def __init__(self,obstacles,height=None,width=None,bucket=None):
+        self.obstacles = [(kind,tuple(tuple(float(v) for v in vertex) for vertex in shape) if kind=="polygon" else tuple(float(v) for v in shape)) for kind,shape in obstacles]
+        self.height,self.width = height,width
+        self.boxes = np.array([boundingBox(kind,shape) for kind,shape in self.obstacles],dtype=np.float64).reshape(-1,4)
+        if bucket is None:
+            sizes = np.maximum(self.boxes[:,2]-self.boxes[:,0],self.boxes[:,3]-self.boxes[:,1])
+            bucket = max(float(np.mean(sizes))*2,1.0) if len(sizes) else 1.0
+        self.BUCKET = bucket
+        self.buildIndex()
+
+    #Bucket (row,column) b covers [b*BUCKET,(b+1)*BUCKET) mm. The index is CSR like: the obstacles of bucket k are
+    #members[starts[k]:starts[k+1]], for the buckets of the box spanned by the obstacles
+    def buildIndex(self):
+        if len(self.boxes)==0:
+            self.origin = (0,0)
+            self.ROWS = self.COLUMNS = 0
+            self.starts = np.zeros(1,dtype=np.int64)
+            self.members = np.zeros(0,dtype=np.int64)
+            return
+        first = np.floor(self.boxes[:,:2]/self.BUCKET).astype(np.int64)
+        last = np.floor(self.boxes[:,2:]/self.BUCKET).astype(np.int64)
+        self.origin = (int(first[:,0].min()),int(first[:,1].min()))
+        self.COLUMNS = int(last[:,0].max())-self.origin[0]+1
+        self.ROWS = int(last[:,1].max())-self.origin[1]+1
+        first -= self.origin
+        last -= self.origin
+        spans = (last-first+1)
+        counts = spans[:,0]*spans[:,1]
+        owners = np.repeat(np.arange(len(self.boxes)),counts)
+        #Position of every (obstacle,bucket) pair inside the block of buckets of its obstacle
+        offsets = np.arange(counts.sum())-np.repeat(np.cumsum(counts)-counts,counts)
+        columns = first[owners,0]+offsets%spans[owners,0]
+        rows = first[owners,1]+offsets//spans[owners,0]
+        buckets = rows*self.COLUMNS+columns
+        order = np.argsort(buckets,kind="stable")
+        self.members = owners[order]
+        self.starts = np.searchsorted(buckets[order],np.arange(self.ROWS*self.COLUMNS+1))
+
+    #Indices of the obstacles whose bounding box may touch the box x0..x1,y0..y1 in mm, ascending
+    def query(self,x0,y0,x1,y1):
+        if len(self.members)==0:
+            return self.members
+        bx0,by0 = int(np.floor(x0/self.BUCKET))-self.origin[0],int(np.floor(y0/self.BUCKET))-self.origin[1]
+        bx1,by1 = int(np.floor(x1/self.BUCKET))-self.origin[0],int(np.floor(y1/self.BUCKET))-self.origin[1]
+        bx0,by0,bx1,by1 = max(bx0,0),max(by0,0),min(bx1,self.COLUMNS-1),min(by1,self.ROWS-1)
+        if bx0>bx1 or by0>by1:
+            return self.members[:0]
+        parts = [self.members[self.starts[row*self.COLUMNS+bx0]:self.starts[row*self.COLUMNS+bx1+1]] for row in range(by0,by1+1)]
+        return np.unique(np.concatenate(parts))
+
+    #True if the point (x,y) in mm is inside an obstacle
+    def contains(self,x,y):
+        for i in self.query(x,y,x,y):
+            kind,shape = self.obstacles[i]
+            if shapeMask(kind,shape,np.float64(x),np.float64(y)):
+                return True
+        return False
+
+    #Boolean mask of the cells covered by an obstacle, for map rows y0..y1 given as rows=(y0,y1) (all rows by default)
+    #and columns x0..x1 given as columns, like actualObstacleMask. Cell (y,x) is the point (x,y)*resolution
+    def mask(self,shape,resolution=1.0,rows=None,columns=None):
+        y0,y1 = (0,shape[0]) if rows is None else rows
+        x0,x1 = (0,shape[1]) if columns is None else columns
+        out = np.zeros((y1-y0,x1-x0),dtype=bool)
+        if y1<=y0 or x1<=x0:
+            return out
+        for i in self.query(x0*resolution,y0*resolution,(x1-1)*resolution,(y1-1)*resolution):
+            kind,obstacle = self.obstacles[i]
+            bx0,by0,bx1,by1 = self.boxes[i]
+            #Cells whose point is inside the bounding box
+            cx0,cx1 = max(x0,int(np.ceil(bx0/resolution-1e-9))),min(x1,int(np.floor(bx1/resolution+1e-9))+1)
+            cy0,cy1 = max(y0,int(np.ceil(by0/resolution-1e-9))),min(y1,int(np.floor(by1/resolution+1e-9))+1)
+            if cx1<=cx0 or cy1<=cy0:
+                continue
+            ys,xs = np.mgrid[cy0:cy1,cx0:cx1]
+            if resolution != 1:
+                ys,xs = ys*resolution,xs*resolution
+            out[cy0-y0:cy1-y0,cx0-x0:cx1-x0] |= shapeMask(kind,obstacle,xs,ys)
+        return out
+
+    #Hash of the obstacles and the map size, part of the occupancy cache key
+    def key(self):
+        return hashlib.sha256(repr((self.obstacles,self.height,self.width)).encode()).hexdigest()
+
+    def toJson(self):
+        obstacles = [{kind:[list(vertex) for vertex in shape] if kind=="polygon" else list(shape)} for kind,shape in self.obstacles]
+        scene = {"obstacles":obstacles}
+        if self.height is not None:
+            scene.update(height=self.height,width=self.width)
+        return scene
+
+#Scene from a parsed JSON document, see the top of the file
+def sceneFromJson(document,bucket=None)->Scene:
+    obstacles = []
+    for number,item in enumerate(document["obstacles"]):
+        if len(item)!=1 or next(iter(item)) not in KINDS:
+            raise ValueError("obstacle {}: expected one of {} as its only key, got {}".format(number,KINDS,list(item)))
+        kind,shape = next(iter(item.items()))
+        if kind=="polygon":
+            if len(shape)<3 or any(len(vertex)!=2 for vertex in shape):
+                raise ValueError("obstacle {}: a polygon needs at least 3 [x,y] vertices".format(number))
+            if not isConvex([tuple(vertex) for vertex in shape]):
+                raise ValueError("obstacle {}: the polygon is not convex, split it into convex parts".format(number))
+        elif len(shape)!=(4 if kind=="rectangle" else 3):
+            raise ValueError("obstacle {}: a {} is {}".format(number,kind,"[x0,y0,x1,y1]" if kind=="rectangle" else "[x,y,radius]"))
+        obstacles.append((kind,shape))
+    return Scene(obstacles,document.get("height"),document.get("width"),bucket)
+
+def loadScene(path,bucket=None)->Scene:
+    with open(path) as file:
+        return sceneFromJson(json.load(file),bucket)
+
+def saveScene(scene:Scene,path):
+    with open(path,"w") as file:
+        json.dump(scene.toJson(),file)
+
+#The README obstacles as a scene, its mask is the one of actualObstacleMask
+def defaultScene()->Scene:
+    import dijkstra_Vedant_Ranade as planner
+    obstacles = [("rectangle",(100,0,150,100)),("rectangle",(100,150,150,planner.MAP_HEIGHT)),
+                 ("polygon",planner.hex_actual_vertex),("polygon",planner.triangle_actual)]
+    return Scene(obstacles,planner.MAP_HEIGHT,planner.MAP_WIDTH)
+
+#count random obstacles (rectangles, circles and convex polygons up to size mm across) on a height x width mm map
+def randomScene(count,height,width,size=20.0,seed=0)->Scene:
+    rng = np.random.default_rng(seed)
+    obstacles = []
+    for kind,x,y,s in zip(rng.integers(0,3,count),rng.uniform(0,width,count),rng.uniform(0,height,count),rng.uniform(size/4,size,count)):
+        if kind==0:
+            obstacles.append(("rectangle",(x,y,x+s,y+s*rng.uniform(0.3,1))))
+        elif kind==1:
+            obstacles.append(("circle",(x,y,s/2)))
+        else:
+            #Points on a circle in angle order make a convex polygon
+            angles = np.sort(rng.uniform(0,2*np.pi,int(rng.integers(3,8))))
+            obstacles.append(("polygon",[(x+s/2*np.cos(a),y+s/2*np.sin(a)) for a in angles]))
+    return Scene(obstacles,height,width)
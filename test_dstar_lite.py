@@ -0,0 +1,59 @@
+#D* Lite repairs must give the result of a fresh search on the changed grid
+#Imports
+import numpy as np
+import pytest
+import dijkstra_Vedant_Ranade as planner
+import dstar_lite
+
+START,GOAL = planner.flipY((6,6)),planner.flipY((120,594))
+
+def test_first_plan_matches_dijkstra(copyGrid):
+    grid = copyGrid()
+    result = dstar_lite.DStarLite(START,GOAL,grid).plan()
+    assert result.cost == pytest.approx(planner.dijkstraArray(START,GOAL,grid).cost)
+
+def test_replan_after_new_obstacles_matches_fresh_search(copyGrid):
+    grid = copyGrid()
+    replanner = dstar_lite.DStarLite(START,GOAL,grid)
+    path = replanner.plan().path
+    #The robot drives 100 cells at a time and finds a square obstacle 20 cells ahead
+    for _ in range(3):
+        y,x = path[120]
+        robot = path[100]
+        replanner.moveTo(robot)
+        result = replanner.updateCells([(y+dy,x+dx) for dy in range(-3,4) for dx in range(-3,4)])
+        assert result.path[0]==robot
+        assert result.cost == pytest.approx(planner.dijkstraArray(robot,GOAL,grid).cost)
+        path = result.path
+    #The repair only looks at the cells around the change, not at the whole map
+    assert replanner.expanded < planner.dijkstraArray(START,GOAL,grid).expanded
+
+def test_changes_made_outside_update_cells_are_picked_up(copyGrid):
+    grid = copyGrid()
+    replanner = dstar_lite.DStarLite(START,GOAL,grid)
+    path = replanner.plan().path
+    grid.setFree(path[200:210],False)
+    assert replanner.plan().cost == pytest.approx(planner.dijkstraArray(START,GOAL,grid).cost)
+
+@pytest.mark.parametrize("start,goal",[((20,20),(10,612)),((-1,5),(10,10)),((20,20),planner.flipY((149,120)))])
+def test_invalid_cells_raise(start,goal,copyGrid):
+    with pytest.raises(ValueError):
+        dstar_lite.DStarLite(start,goal,copyGrid())
+
+def test_move_to_blocked_cell_raises(copyGrid):
+    replanner = dstar_lite.DStarLite(START,GOAL,copyGrid())
+    with pytest.raises(ValueError):
+        replanner.moveTo(planner.flipY((149,120)))
+
+#Freeing a cell outside the map would open the padding around it, the whole update is refused
+@pytest.mark.parametrize("outside",[(-1,5),(5,600),(250,5)])
+def test_update_cells_outside_the_map_raise(outside,copyGrid):
+    grid = copyGrid()
+    replanner = dstar_lite.DStarLite(START,GOAL,grid)
+    bits = grid.bits.copy()
+    with pytest.raises(ValueError):
+        replanner.updateCells([(20,20),outside],blocked=False)
+    with pytest.raises(ValueError):
+        replanner.updateCells([(20,20),outside])
+    assert np.array_equal(grid.bits,bits)
+    assert replanner.plan().cost == pytest.approx(planner.dijkstraArray(START,GOAL,grid).cost)
@@ -0,0 +1,56 @@
+#Frames of the visualization must only grow, show every path cell from its first expansion on and fit the frame budget
+#Imports
+import numpy as np
+import pytest
+import dijkstra_Vedant_Ranade as planner
+from dijkstra_Vedant_Ranade import OccupancyGrid,SearchResult
+import visualization
+
+def test_frames_follow_the_expansion_order():
+    start,goal = planner.flipY((6,6)),planner.flipY((120,594))
+    result = planner.dijkstraArray(start,goal,recordOrder=True)
+    ends = planner.expansionFrames(result)
+    order = result.expansionOrder.tolist()
+    assert len(ends)==len(result.path)
+    assert (np.diff(ends)>=0).all() and ends[-1]<=len(order)
+    #Frame k is everything expanded up to and including the k-th path cell
+    for cell,end in zip(result.path,ends.tolist()):
+        assert order.index(planner.getOccupancyGrid().index(*cell))==end-1
+
+def test_cell_expanded_twice_uses_its_first_expansion():
+    grid = OccupancyGrid(np.ones((3,3),dtype=bool))
+    a,b,c = grid.index(0,0),grid.index(0,1),grid.index(0,2)
+    other,again = grid.index(1,1),grid.index(2,2)
+    order = np.array([a,other,b,again,b,c],dtype=np.int64)
+    result = SearchResult([(0,0),(0,1),(0,2)],2.0,len(order),expansionOrder=order)
+    assert planner.expansionFrames(result,grid).tolist()==[1,3,6]
+
+def test_cell_never_expanded_keeps_the_frame_before():
+    grid = OccupancyGrid(np.ones((3,3),dtype=bool))
+    order = np.array([grid.index(0,0),grid.index(1,1),grid.index(0,2)],dtype=np.int64)
+    result = SearchResult([(0,0),(0,1),(0,2)],2.0,len(order),expansionOrder=order)
+    assert planner.expansionFrames(result,grid).tolist()==[1,1,3]
+
+@pytest.mark.parametrize("spacing",["linear","log"])
+@pytest.mark.parametrize("count,frames",[(10,3),(1000,50),(50,200),(1,10)])
+def test_sampled_frames_grow_up_to_the_whole_expansion(spacing,count,frames):
+    ends = visualization.sampleExpansion(count,frames,spacing)
+    assert len(ends)==frames
+    assert (np.diff(ends)>=0).all() and ends.max()<=count
+    assert ends[-1]==count
+
+def test_log_spacing_starts_with_one_expansion():
+    ends = visualization.sampleExpansion(100000,40,"log")
+    assert ends[0]==1 and ends[-1]==100000
+    #Geometric: the first frames are closer together than the last ones
+    assert ends[1]-ends[0] < ends[-1]-ends[-2]
+
+@pytest.mark.parametrize("spacing",["linear","log"])
+@pytest.mark.parametrize("frames",[20,120,600])
+def test_frame_plan_fits_the_budget(spacing,frames):
+    start,goal = planner.flipY((6,6)),planner.flipY((120,594))
+    result = planner.astarArray(start,goal,recordOrder=True)
+    frameEnds,steps = visualization.framePlan(result,frames,spacing)
+    assert visualization.frameCount(result,frameEnds,steps) <= frames
+    assert frameEnds[-1]==len(result.expansionOrder)
+    assert steps[0]==0 and steps[-1]==len(result.path)-1 and (np.diff(steps)>0).all()
@@ -0,0 +1,52 @@
+#HPA* paths must be valid, no shorter than the optimal path and within HPA_BOUND of it
+#Imports
+import gc
+import pytest
+import dijkstra_Vedant_Ranade as planner
+import hpa
+
+#Edges of a cluster graph in an order that does not depend on the order they were found in
+def edgesOf(graph):
+    transitions = {key:sorted(moves) for key,moves in graph.transitions.items() if moves}
+    intra = {cluster:{a:sorted(others) for a,others in edges.items()} for cluster,edges in graph.intra.items() if edges}
+    inter = {a:sorted(others) for a,others in graph.inter.items()}
+    return transitions,intra,inter
+
+def test_paths_are_valid_and_within_the_bound(randomQueries):
+    grid = planner.getOccupancyGrid()
+    for start,goal in randomQueries(30,seed=13):
+        result = hpa.hpaSearch(start,goal)
+        optimal = planner.astarArray(start,goal).cost
+        assert result.path[0]==start and result.path[-1]==goal
+        assert all(max(abs(y1-y0),abs(x1-x0))==1 for (y0,x0),(y1,x1) in zip(result.path,result.path[1:]))
+        assert all(planner.isValidCell(cell,grid) for cell in result.path)
+        assert result.cost == pytest.approx(planner.pathCost(result.path))
+        assert optimal-1e-6 <= result.cost <= optimal*hpa.HPA_BOUND+1e-6
+
+def test_update_after_edits_matches_a_fresh_build(copyGrid):
+    grid = copyGrid()
+    graph = hpa.getClusterGraph(grid)
+    start,goal = planner.flipY((6,6)),planner.flipY((120,594))
+    path = hpa.hpaSearch(start,goal,grid).path
+    #A wall across the path and a blocked cluster border
+    grid.setFree([(y,path[200][1]) for y in range(path[200][0]-6,path[200][0]+7)],False)
+    grid.setFree([(y,x) for y in range(40,50) for x in (63,64)],False)
+    assert graph.update()
+    assert edgesOf(graph)==edgesOf(hpa.ClusterGraph(grid))
+    assert hpa.getClusterGraph(grid) is graph
+    result = hpa.hpaSearch(start,goal,grid)
+    assert all(grid.isFree(y,x) for y,x in result.path)
+
+def test_graphs_are_dropped_with_their_grid(copyGrid):
+    grid = copyGrid()
+    hpa.getClusterGraph(grid,16)
+    assert grid in hpa.CLUSTER_GRAPHS
+    count = len(hpa.CLUSTER_GRAPHS)
+    del grid
+    gc.collect()
+    assert len(hpa.CLUSTER_GRAPHS)==count-1
+
+def test_nbytes_counts_the_edges(copyGrid):
+    graph = hpa.getClusterGraph(copyGrid())
+    edges = sum(len(moves) for moves in graph.transitions.values())
+    assert graph.nbytes > graph.snapshot.nbytes+edges*3*8
@@ -0,0 +1,71 @@
+#The lazy occupancy grid must answer like the grid built up front
+#Imports
+import numpy as np
+import pytest
+import dijkstra_Vedant_Ranade as planner
+import dstar_lite
+import hpa
+
+def test_whole_map_matches_eager_grid():
+    lazy = planner.buildLazyOccupancyGrid(tile=32)
+    assert np.array_equal(lazy.freeMask(),planner.getOccupancyGrid().freeMask())
+
+@pytest.mark.parametrize("mode",list(planner.PLANNERS))
+def test_planners_match_eager_grid(mode,randomQueries):
+    eager = planner.getOccupancyGrid()
+    for start,goal in randomQueries(4,seed=9):
+        expected = planner.plan(start,goal,mode,eager)
+        result = planner.plan(start,goal,mode,planner.buildLazyOccupancyGrid(tile=32))
+        assert result.cost == pytest.approx(expected.cost)
+        if mode!="hpa":
+            assert result.path==expected.path
+
+def test_short_query_on_a_huge_map_resolves_few_tiles():
+    planner.configureMap(20000,20000,1.0)
+    planner.configureLazy()
+    grid = planner.getOccupancyGrid()
+    result = planner.plan((5000,5000),(5100,5200),"astar")
+    assert result.found()
+    assert grid.loads < 20
+
+#A long query reads many more tiles than the cap, the kept tiles stay under it and the answer is the same
+def test_kept_tiles_stay_under_the_cap():
+    lazy = planner.buildLazyOccupancyGrid(tile=16,maxTiles=32)
+    start,goal = planner.flipY((6,6)),planner.flipY((120,594))
+    result = planner.dijkstraArray(start,goal,lazy)
+    assert lazy.loads > 32 and len(lazy.tiles)==32
+    assert lazy.nbytes <= 32*16*16//8
+    expected = planner.dijkstraArray(start,goal)
+    assert result.cost==expected.cost and result.path==expected.path
+    #An edited tile is kept past the cap, dropping it would lose the change
+    lazy.setFree([(20,20)],False)
+    planner.dijkstraArray(start,goal,lazy)
+    assert not lazy.isFree(20,20) and lazy.nbytes <= 33*16*16//8
+
+def test_changed_cells_are_only_real_edits():
+    lazy = planner.buildLazyOccupancyGrid(tile=32)
+    path = planner.plan(planner.flipY((6,6)),planner.flipY((120,594)),"astar",lazy).path
+    snapshot = lazy.snapshot()
+    #Working out more tiles is not a change
+    lazy.freeMask()
+    lazy.setFree(path[100:103],False)
+    #Blocking a cell that is blocked already is not a change either
+    lazy.setFree([(0,0)],False)
+    expected = sorted(lazy.index(y,x) for y,x in path[100:103])
+    assert lazy.changedCells(snapshot).tolist()==expected
+
+def test_dstar_lite_replan_only_sees_the_edit():
+    lazy = planner.buildLazyOccupancyGrid(tile=32)
+    start,goal = planner.flipY((6,6)),planner.flipY((120,594))
+    replanner = dstar_lite.DStarLite(start,goal,lazy)
+    path = replanner.plan().path
+    lazy.setFree(path[300:303],False)
+    result = replanner.plan()
+    assert result.cost == pytest.approx(planner.dijkstraArray(start,goal,lazy).cost)
+    assert replanner.expanded < 1000
+
+def test_hpa_update_only_rebuilds_changed_clusters():
+    lazy = planner.buildLazyOccupancyGrid(tile=32)
+    graph = hpa.getClusterGraph(lazy)
+    lazy.setFree([(60,250)],False)
+    assert graph.update()==[graph.clusterOf(lazy.index(60,250))]
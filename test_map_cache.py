@@ -0,0 +1,50 @@
+#A damaged cache entry must be rebuilt, never returned
+#Imports
+import json
+import os
+import numpy as np
+import pytest
+import dijkstra_Vedant_Ranade as planner
+import map_cache
+
+KEY = map_cache.cacheKey("test",1)
+
+def mismatchKey(dataPath,metaPath):
+    with open(metaPath) as file:
+        meta = json.load(file)
+    meta["key"] = map_cache.cacheKey("test",2)
+    with open(metaPath,"w") as file:
+        json.dump(meta,file)
+
+def flipByte(dataPath,metaPath):
+    with open(dataPath,"r+b") as file:
+        file.seek(-1,os.SEEK_END)
+        byte = file.read(1)[0]
+        file.seek(-1,os.SEEK_END)
+        file.write(bytes([byte^0xFF]))
+
+def truncateData(dataPath,metaPath):
+    with open(dataPath,"r+b") as file:
+        file.truncate(os.path.getsize(dataPath)//2)
+
+def breakJson(dataPath,metaPath):
+    with open(metaPath,"w") as file:
+        file.write('{"key": ')
+
+@pytest.mark.parametrize("damage",[mismatchKey,flipByte,truncateData,breakJson])
+def test_damaged_entry_is_rebuilt(damage,tmp_path,monkeypatch):
+    monkeypatch.setattr(map_cache,"CACHE_ENABLED",True)
+    builds = []
+    def build():
+        builds.append(1)
+        return planner.getOccupancyGrid().bits.copy()
+    fresh = build()
+    first = map_cache.loadOrBuild("grid",KEY,build,str(tmp_path))
+    assert np.array_equal(first,fresh) and len(builds)==2
+    del first
+    damage(*map_cache.entryPaths("grid",KEY,str(tmp_path)))
+    assert map_cache.load("grid",KEY,str(tmp_path)) is None
+    rebuilt = map_cache.loadOrBuild("grid",KEY,build,str(tmp_path))
+    assert np.array_equal(rebuilt,fresh) and len(builds)==3
+    #The rebuilt entry is written back and loads without another build
+    assert np.array_equal(map_cache.loadOrBuild("grid",KEY,build,str(tmp_path)),fresh) and len(builds)==3
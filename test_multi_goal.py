@@ -0,0 +1,41 @@
+#One search to many goals must give the result of one search per goal
+#Imports
+import numpy as np
+import pytest
+import dijkstra_Vedant_Ranade as planner
+
+START = planner.flipY((6,6))
+
+def test_every_goal_matches_a_single_search(randomCells):
+    goals = randomCells(12,seed=10)
+    goals += [goals[0]]
+    results = planner.planGoals(START,goals)
+    for goal,result in zip(goals,results):
+        expected = planner.dijkstraArray(START,goal)
+        assert result.cost==expected.cost and result.path==expected.path
+    #One search, not one per goal
+    assert results[0].expanded <= planner.dijkstraArray(START,goals[int(np.argmax([r.cost for r in results]))]).expanded
+
+def test_nearest_k_goals(randomCells):
+    goals = randomCells(12,seed=11)
+    costs = [planner.dijkstraArray(START,goal).cost for goal in goals]
+    results = planner.planGoals(START,goals,k=3)
+    found = sorted(result.cost for result in results if result.found())
+    assert found==pytest.approx(sorted(costs)[:3])
+
+def test_invalid_goals_get_empty_results():
+    goals = [(10,612),(-1,-1),planner.flipY((149,120)),planner.flipY((80,80))]
+    results = planner.planGoals(START,goals)
+    assert [result.found() for result in results]==[False,False,False,True]
+    #A blocked goal does not keep the search running over the whole map
+    assert results[3].expanded < planner.dijkstraArray(START,planner.flipY((120,594))).expanded
+
+def test_observer_gets_every_goal_nearest_first(randomCells):
+    class Goals(planner.SearchObserver):
+        def __init__(self):
+            self.costs = []
+        def onGoalReached(self,goal,cost):
+            self.costs.append(cost)
+    observer = Goals()
+    results = planner.planGoals(START,randomCells(5,seed=12),observer=observer)
+    assert observer.costs==sorted(result.cost for result in results)
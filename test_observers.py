@@ -0,0 +1,41 @@
+#Observers get the events of every planner in batches, relaxations only when they ask for them
+#Imports
+import numpy as np
+import pytest
+import dijkstra_Vedant_Ranade as planner
+
+class Recorder(planner.SearchObserver):
+    BATCH = 100
+    def __init__(self,wantsRelax):
+        self.WANTS_RELAX = wantsRelax
+        self.batches = []
+        self.relaxed = 0
+        self.goals = []
+    def onExpand(self,cells):
+        self.batches.append(cells)
+    def onRelax(self,cells,costs):
+        assert len(cells)==len(costs)
+        self.relaxed += len(cells)
+    def onGoalReached(self,goal,cost):
+        self.goals.append((goal,cost))
+
+START,GOAL = planner.flipY((6,6)),planner.flipY((120,594))
+
+@pytest.mark.parametrize("mode",list(planner.PLANNERS))
+@pytest.mark.parametrize("wantsRelax",[False,True])
+def test_observer_gets_batches_relaxations_and_the_goal_cost(mode,wantsRelax):
+    observer = Recorder(wantsRelax)
+    result = planner.PLANNERS[mode](START,GOAL,observer=observer)
+    sizes = [len(batch) for batch in observer.batches]
+    #Full batches, only the last one can be shorter
+    assert sizes and all(size==Recorder.BATCH for size in sizes[:-1]) and 0<sizes[-1]<=Recorder.BATCH
+    assert all(batch.dtype==np.int64 for batch in observer.batches)
+    assert (observer.relaxed>0)==wantsRelax
+    assert observer.goals==[(planner.getOccupancyGrid().index(*GOAL),result.cost)]
+
+def test_no_goal_event_without_a_path(copyGrid):
+    grid = copyGrid()
+    grid.setFree([(GOAL[0]+dy,GOAL[1]+dx) for dy in (-1,0,1) for dx in (-1,0,1) if dy or dx],False)
+    observer = Recorder(False)
+    assert not planner.astarArray(START,GOAL,grid,observer=observer).found()
+    assert observer.goals==[] and observer.batches
@@ -0,0 +1,54 @@
+#The vectorized obstacle map must be the map the original per pixel tests draw
+#Imports
+import numpy as np
+import pytest
+import dijkstra_Vedant_Ranade as planner
+
+def test_vectorized_map_matches_per_pixel_map():
+    assert planner.verifyObstacleMap(planner.getObstacleMap())
+
+def test_verify_rejects_a_changed_map():
+    obstacleMap = planner.getObstacleMap().copy()
+    obstacleMap[10,10] = planner.OBSTACLE_COLOR
+    assert not planner.verifyObstacleMap(obstacleMap)
+
+def test_obstacle_mask_matches_per_pixel_tests():
+    mask = planner.obstacleMask((250,600,3))
+    reference = planner.npObstacleMapPerPixel(np.full((250,600,3),125,dtype=np.uint8))
+    assert np.array_equal(mask,np.any(reference!=125,axis=-1))
+
+#A cell outside the map must raise before the grid or the rendered map is touched, even with valid cells next to it
+@pytest.mark.parametrize("outside",[(-1,20),(20,-1),(250,20),(20,600)])
+def test_update_obstacles_rejects_cells_outside_the_map(outside):
+    grid = planner.getOccupancyGrid()
+    bits,obstacleMap = grid.bits.copy(),planner.getObstacleMap().copy()
+    with pytest.raises(ValueError):
+        planner.updateObstacles([(20,20),outside])
+    assert np.array_equal(grid.bits,bits) and np.array_equal(planner.getObstacleMap(),obstacleMap)
+    lazy = planner.buildLazyOccupancyGrid(tile=32)
+    with pytest.raises(ValueError):
+        lazy.setFree([(20,20),outside],False)
+    assert len(lazy.edits)==0 and lazy.isFree(20,20)
+
+#With the default clearance of 5 the planner grid keeps the hand padded rectangles and walls of the original planner,
+#only the corners next to the gap between the rectangles are rounded and free
+def test_clearance_5_reproduces_the_rectangle_and_wall_padding():
+    blocked = planner.configurationSpace((250,600,3),5,0,1.0)
+    ys,xs = np.indices((250,600))
+    walls = (ys<5) | (ys>=245) | (xs<5) | (xs>=595)
+    padded = planner.rectangle1Mask(xs,ys) | planner.rectangle2Mask(xs,ys) | walls
+    corners = np.zeros((250,600),dtype=bool)
+    for y in (100,150):
+        for x in (100,150):
+            corners[y-5:y+5,x-5:x+5] = True
+    left = xs<200
+    assert np.array_equal(blocked[left & ~corners],padded[left & ~corners])
+    assert not (blocked & corners & ~padded).any()
+    assert blocked[walls].all()
+
+#Small maps threshold one shared distance field, large ones transform a window per band, both give the same grid
+@pytest.mark.parametrize("clearance,robotRadius",[(5,0),(3,4.5),(0,0)])
+def test_shared_distance_field_matches_the_windowed_one(clearance,robotRadius,monkeypatch):
+    shared = planner.configurationSpace((250,600,3),clearance,robotRadius,1.0)
+    monkeypatch.setattr(planner,"DISTANCE_FIELD_CELLS",0)
+    assert np.array_equal(planner.configurationSpaceRows(0,250,(250,600,3),clearance,robotRadius,1.0),shared)
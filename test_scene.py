@@ -0,0 +1,49 @@
+#Scenes must give the README map back and their bucket index must answer like a scan of every obstacle
+#Imports
+import os
+import numpy as np
+import pytest
+import dijkstra_Vedant_Ranade as planner
+import scene
+
+README_SCENE = os.path.join(os.path.dirname(os.path.abspath(__file__)),"scenes","readme.json")
+
+def test_readme_scene_reproduces_the_readme_occupancy():
+    default = planner.getOccupancyGrid().freeMask()
+    obstacles = planner.actualObstacleMask((250,600))
+    planner.configureScene(scene.loadScene(README_SCENE))
+    assert np.array_equal(planner.actualObstacleMask((250,600)),obstacles)
+    assert np.array_equal(planner.getOccupancyGrid().freeMask(),default)
+
+def test_index_matches_a_scan_of_every_obstacle():
+    randomScene = scene.randomScene(300,200,300,seed=3)
+    rng = np.random.default_rng(4)
+    for x0,y0,w,h in zip(rng.uniform(-20,300,50),rng.uniform(-20,200,50),rng.uniform(0,60,50),rng.uniform(0,60,50)):
+        boxes = randomScene.boxes
+        touching = np.flatnonzero((boxes[:,0]<=x0+w) & (boxes[:,2]>=x0) & (boxes[:,1]<=y0+h) & (boxes[:,3]>=y0))
+        found = randomScene.query(x0,y0,x0+w,y0+h)
+        #Buckets may list obstacles near the box as well, never miss one that touches it
+        assert set(touching.tolist()) <= set(found.tolist())
+        assert found.tolist()==sorted(set(found.tolist()))
+    for x,y in zip(rng.uniform(0,300,500),rng.uniform(0,200,500)):
+        inside = any(scene.shapeMask(kind,shape,np.float64(x),np.float64(y)) for kind,shape in randomScene.obstacles)
+        assert randomScene.contains(x,y)==inside
+    ys,xs = np.mgrid[0:200,0:300].astype(np.float64)
+    naive = np.zeros((200,300),dtype=bool)
+    for kind,shape in randomScene.obstacles:
+        naive |= scene.shapeMask(kind,shape,xs,ys)
+    assert np.array_equal(randomScene.mask((200,300)),naive)
+
+@pytest.mark.parametrize("obstacle",[
+    {"square":[0,0,1,1]},
+    {"rectangle":[0,0,1,1],"circle":[0,0,1]},
+    {},
+    {"rectangle":[0,0,1]},
+    {"circle":[0,0,1,2]},
+    {"polygon":[[0,0],[1,1]]},
+    {"polygon":[[0,0],[1,1,2],[0,1]]},
+    {"polygon":[[0,0],[4,0],[1,1],[0,4]]},
+])
+def test_malformed_obstacles_raise(obstacle):
+    with pytest.raises(ValueError):
+        scene.sceneFromJson({"obstacles":[{"circle":[5,5,1]},obstacle]})
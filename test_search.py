@@ -0,0 +1,103 @@
+#The array backed planners against the original solver and against each other
+#Imports
+import pytest
+import dijkstra_Vedant_Ranade as planner
+
+#The README queries, typed like at the prompt
+README_QUERIES = [((6,6),(80,80)),((6,6),(120,594))]
+
+def test_array_dijkstra_matches_legacy_solver():
+    start,goal = (planner.flipY(point) for point in README_QUERIES[0])
+    node,_ = planner.dikstra(start,goal)
+    result = planner.dijkstraArray(start,goal)
+    assert result.cost == pytest.approx(node.cost)
+    assert result.path[0]==start and result.path[-1]==goal
+    assert result.cost == pytest.approx(planner.pathCost(result.path))
+
+def test_unreachable_goal_has_no_path(copyGrid):
+    grid = copyGrid()
+    goal = planner.flipY((120,594))
+    grid.setFree([(goal[0]+dy,goal[1]+dx) for dy in (-1,0,1) for dx in (-1,0,1) if dy or dx],False)
+    result = planner.dijkstraArray(planner.flipY((6,6)),goal,grid)
+    assert not result.found() and result.path==[]
+
+def test_astar_matches_dijkstra_cost(randomQueries):
+    for start,goal in randomQueries(8,seed=4):
+        baseline = planner.dijkstraArray(start,goal)
+        result = planner.astarArray(start,goal)
+        assert result.cost == pytest.approx(baseline.cost)
+        assert result.expanded <= baseline.expanded
+
+def test_expansion_savings_reuses_the_result():
+    start,goal = (planner.flipY(point) for point in README_QUERIES[1])
+    result = planner.astarArray(start,goal)
+    baseline,expanded,saved = planner.expansionSavings(start,goal,"astar",result=result)
+    assert expanded==result.expanded and saved==baseline-expanded>0
+
+@pytest.mark.parametrize("mode",["bidirectional","bidirectional-astar"])
+def test_bidirectional_matches_dijkstra_cost(mode,randomQueries):
+    for start,goal in randomQueries(8,seed=5):
+        baseline = planner.dijkstraArray(start,goal)
+        result = planner.PLANNERS[mode](start,goal)
+        assert result.cost == pytest.approx(baseline.cost)
+        assert result.path[0]==start and result.path[-1]==goal
+        assert result.cost == pytest.approx(planner.pathCost(result.path))
+
+def test_jps_matches_dijkstra_cost(randomQueries):
+    for start,goal in randomQueries(8,seed=6):
+        baseline = planner.dijkstraArray(start,goal)
+        result = planner.jpsArray(start,goal)
+        assert result.cost == pytest.approx(baseline.cost)
+        #The waypoints are expanded into a path of single moves over free cells
+        assert all(max(abs(y1-y0),abs(x1-x0))==1 for (y0,x0),(y1,x1) in zip(result.path,result.path[1:]))
+        assert all(planner.isValidCell(cell) for cell in result.path)
+
+def test_cost_field_answers_like_a_fresh_search(randomQueries):
+    cache = planner.CostFieldCache()
+    source = planner.flipY((6,6))
+    for _,goal in randomQueries(8,seed=7):
+        result = planner.planFromSource(source,goal,cache=cache)
+        assert result.cost == pytest.approx(planner.dijkstraArray(source,goal).cost)
+    assert len(cache.fields)==1
+
+def test_cost_field_rejects_invalid_cells():
+    cache = planner.CostFieldCache()
+    #(10,612) is outside the 600 column map, it must not wrap to a cell of the next row
+    for source,goal in [((20,20),(10,612)),((-5,20),(10,12)),((20,20),planner.flipY((149,120)))]:
+        assert not planner.planFromSource(source,goal,cache=cache).found()
+    assert len(cache.fields)==0
+
+def test_batch_matches_single_queries_and_skips_invalid_pairs(randomQueries):
+    queries = randomQueries(4,seed=8)
+    invalid = [((-5,700),(6,6)),((20,20),(10,612)),((20,20),planner.flipY((149,120)))]
+    results = planner.planBatch(queries+invalid,"astar",processes=2)
+    for (start,goal),(path,cost,expanded) in zip(queries,results):
+        assert cost == pytest.approx(planner.astarArray(start,goal).cost)
+    assert results[len(queries):]==[([],None,0)]*len(invalid)
+
+#Counts every push the search makes through the relaxations it reports, the start is the one push not reported
+class PushCounter(planner.SearchObserver):
+    WANTS_RELAX = True
+    def __init__(self):
+        self.relaxed = []
+        self.expanded = 0
+    def onExpand(self,cells):
+        self.expanded += len(cells)
+    def onRelax(self,cells,costs):
+        self.relaxed += cells.tolist()
+
+def test_heap_metrics_count_every_push_and_stale_pop():
+    #A sweep of the whole map empties the heap: every push is popped, every re-push of a cell leaves one stale entry
+    counter = PushCounter()
+    result = planner.searchArray(planner.flipY((6,6)),None,metrics=True,observer=counter)
+    metrics = result.metrics
+    rePushes = len(counter.relaxed)-len(set(counter.relaxed))
+    assert metrics["pushes"]==1+len(counter.relaxed)
+    assert metrics["expanded"]==counter.expanded==result.expanded
+    assert rePushes > 0 and metrics["stalePops"]==metrics["decreaseKeys"]==rePushes
+    assert metrics["pushes"]-(metrics["expanded"]+metrics["stalePops"])==0
+    #A query stops with entries left on the heap, they are the pushes not popped
+    counter = PushCounter()
+    metrics = planner.searchArray(planner.flipY((6,6)),planner.flipY((120,594)),metrics=True,observer=counter).metrics
+    assert metrics["pushes"]==1+len(counter.relaxed)
+    assert 0 < metrics["pushes"]-(metrics["expanded"]+metrics["stalePops"]) <= metrics["peakFrontier"]
@@ -0,0 +1,354 @@
+#Video rendering of the planners in dijkstra_Vedant_Ranade.py
+#Imports
+#Libraries
+import numpy as np
+import cv2
+from tqdm import tqdm
+#Inbuilt modules
+import time
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from itertools import islice
+from multiprocessing import Pool
+from queue import Queue
+#Planner
+import dijkstra_Vedant_Ranade as planner
+from dijkstra_Vedant_Ranade import PLANNERS,mapBounds,mapShape,isValidCell,printSearchResult,expansionFrames,getOccupancyGrid,PhaseTimer,queryMetrics
+
+#Pixel coordinates in mm of the obstacle drawing to cells of the map at the current resolution
+def toPixels(points):
+    return [(int(round((x+1)/planner.RESOLUTION))-1,int(round((y+1)/planner.RESOLUTION))-1) for x,y in points]
+
+#(rows,columns) of the cells of a recorded expansion order, in the same order
+def expansionCells(result):
+    grid = getOccupancyGrid()
+    ys,xs = np.divmod(result.expansionOrder,grid.STRIDE)
+    return ys-grid.PAD,xs-grid.PAD
+
+#Draw the obstacles on an image, in place
+#A configured scene is drawn from its mask, so the video shows exactly the cells the planner sees as obstacles
+def drawObstacles(image):
+    obstacle_color = (255,0,0)
+    if planner.SCENE is not None:
+        image[planner.SCENE.mask(image.shape,planner.RESOLUTION)] = obstacle_color
+        return image
+    #Rectangle 1:
+    corner1,corner2 = toPixels([(99,0),(149,99)])
+    cv2.rectangle(image, corner1 , corner2, obstacle_color ,  -1)
+    #Rectangle 2, up to the top of the map like in the planner:
+    corner1,corner2 = toPixels([(99,149),(149,planner.MAP_HEIGHT-1)])
+    cv2.rectangle(image, corner1 , corner2, obstacle_color ,  -1)
+    #Triangle 1:
+    triangle_corners = toPixels([(460-1, int(25-1)), (460-1, int(225-1)), (int(510-1), 125-1)])
+    cv2.fillPoly(image, np.array([triangle_corners]), obstacle_color)
+    #Hexagon 1:
+    hex_corners = toPixels([(235-1, 163-1),(300-1,200-1),(365-1,163-1),(365-1,88-1),(300-1,50-1),(235-1,88-1)])
+    cv2.fillPoly(image, np.array([hex_corners]), obstacle_color)
+    return image
+
+#Obstacle layer by (map shape,resolution), rasterized once: (background image,boolean mask of the obstacle pixels)
+BACKGROUNDS = {}
+
+def getBackground():
+    key = (mapShape(),planner.RESOLUTION,None if planner.SCENE is None else planner.SCENE.key())
+    if key not in BACKGROUNDS:
+        background = drawObstacles(np.full(mapShape(),125,dtype=np.uint8))
+        BACKGROUNDS[key] = (background,np.any(background!=125,axis=-1))
+    return BACKGROUNDS[key]
+
+#Persistent canvas of a video. It starts as the obstacle layer and every frame only paints what changed since the one
+#before: the newly explored cells, or the robot moving from its old position (the pixels under it are put back) to the new one
+#canvas is the current frame, it is changed in place by the next call, so write (or copy) it first
+class FrameRenderer:
+    ROBOT_RADIUS = 4
+
+    def __init__(self):
+        self.background,self.obstacles = getBackground()
+        self.canvas = self.background.copy()
+        #(y0,x0,pixels) under the robot circle, put back before the robot moves
+        self.underRobot = None
+
+    #Explored color == GREEN, obstacles stay on top
+    def explore(self,ys,xs):
+        visible = ~self.obstacles[ys,xs]
+        self.canvas[ys[visible],xs[visible]] = [0,255,0]
+
+    # Marks path, obstacles stay on top
+    def drawPath(self,path):
+        for y,x in path:
+            cv2.circle(self.canvas, (x,y), 1, (0,0,255),1)
+        self.canvas[self.obstacles] = self.background[self.obstacles]
+
+    #Mark Node position by a circle
+    def moveRobot(self,cell):
+        if self.underRobot is not None:
+            y0,x0,pixels = self.underRobot
+            self.canvas[y0:y0+pixels.shape[0],x0:x0+pixels.shape[1]] = pixels
+        y,x = cell
+        r = self.ROBOT_RADIUS
+        y0,x0 = max(y-r,0),max(x-r,0)
+        self.underRobot = (y0,x0,self.canvas[y0:y+r+1,x0:x+r+1].copy())
+        cv2.circle(self.canvas, (x,y), r, (0,0,255),-1)
+
+#Frame k shows the cells expanded up to frameEnds[k], from expansionFrames or sampleExpansion
+#cells are the (ys,xs) of expansionCells when already known
+def vizExplore(result,frameEnds,renderer:FrameRenderer,cells=None):
+    ys,xs = expansionCells(result) if cells is None else cells
+    previous = 0
+    for end in frameEnds:
+        renderer.explore(ys[previous:end],xs[previous:end])
+        previous = end
+        yield renderer.canvas
+
+#Frames showing the path before the robot starts moving
+HOLD_FRAMES = 5
+
+# Visualize Path and obstacles, path is the list of (y,x) cells
+#HOLD_FRAMES frames of the path over everything explored, then one frame per path cell with the robot on it,
+#or only for the path cells at the indices steps
+def vizPath(renderer:FrameRenderer,path,steps=None):
+    renderer.drawPath(path)
+    for _ in range(HOLD_FRAMES):
+        yield renderer.canvas
+    for step in (range(len(path)) if steps is None else steps):
+        renderer.moveRobot(path[step])
+        yield renderer.canvas
+
+#All the frames of a result, the exploration then the path
+#Every frame is the same canvas buffer, memory stays at one frame however long the video is
+def renderFrames(result,frameEnds=None,steps=None,cells=None):
+    frameEnds = expansionFrames(result) if frameEnds is None else frameEnds
+    renderer = FrameRenderer()
+    yield from vizExplore(result,frameEnds,renderer,cells)
+    yield from vizPath(renderer,result.path,steps)
+
+#Number of frames renderFrames yields
+def frameCount(result,frameEnds=None,steps=None):
+    explore = len(result.path) if frameEnds is None else len(frameEnds)
+    return explore+HOLD_FRAMES+(len(result.path) if steps is None else len(steps))
+
+#Share of a frame budget given to the robot moving along the path
+PATH_SHARE = 0.25
+
+#Frame ends sampling count expansions into frames frames, spaced evenly ("linear") or closer together at the start ("log"),
+#where the search is small and every expansion shows
+def sampleExpansion(count,frames,spacing="linear"):
+    if count==0 or frames<=0:
+        return np.zeros(max(frames,0),dtype=np.int64)
+    if spacing=="log" and frames>1:
+        ends = np.geomspace(1,count,frames)
+    else:
+        ends = np.linspace(count/frames,count,frames)
+    return np.maximum.accumulate(np.minimum(np.ceil(ends-1e-9).astype(np.int64),count))
+
+#(frameEnds,steps) for renderFrames fitting the video in frames frames whatever the size of the search:
+#the path gets PATH_SHARE of them, at most one per cell, the exploration the rest, HOLD_FRAMES+2 frames at the least
+#spacing "path" keeps one exploration frame per path cell like the original videos and ignores frames
+def framePlan(result,frames=None,spacing="path"):
+    if spacing=="path" or frames is None:
+        return expansionFrames(result),None
+    steps = min(len(result.path),max(int(frames*PATH_SHARE),1))
+    explore = max(frames-HOLD_FRAMES-steps,1)
+    steps = np.unique(np.round(np.linspace(0,len(result.path)-1,steps)).astype(np.int64)) if steps else np.zeros(0,dtype=np.int64)
+    return sampleExpansion(len(result.expansionOrder),explore,spacing),steps
+
+#Frames rendered but not encoded yet, bounds the memory of the encoding pipeline
+QUEUE_FRAMES = 4
+#The queue also holds at most this many bytes of frames, a 10000 x 10000 map frame alone is 300 MB
+QUEUE_BYTES = 64*2**20
+#Shortest segment worth its own process in writeVideoParallel
+MIN_SEGMENT_FRAMES = 60
+
+#Frames and seconds spent rendering and encoding a video, the seconds of parallel segments are added up
+class EncodeStats:
+
+    def __init__(self,frames=0,renderTime=0.0,encodeTime=0.0,wallTime=0.0):
+        self.frames = frames
+        self.renderTime = renderTime
+        self.encodeTime = encodeTime
+        self.wallTime = wallTime
+
+    def add(self,other):
+        self.frames += other.frames
+        self.renderTime += other.renderTime
+        self.encodeTime += other.encodeTime
+
+    def renderFps(self):
+        return self.frames/self.renderTime if self.renderTime else float("inf")
+
+    def encodeFps(self):
+        return self.frames/self.encodeTime if self.encodeTime else float("inf")
+
+#mp4 writer opened with the size of the first frame, counts the seconds spent encoding in stats
+class FrameWriter:
+
+    def __init__(self,filename,fps,stats:EncodeStats):
+        self.filename = filename
+        self.fps = fps
+        self.stats = stats
+        self.writer = None
+
+    def write(self,frame):
+        before = time.perf_counter()
+        if self.writer is None:
+            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+            self.writer = cv2.VideoWriter(self.filename,fourcc,self.fps,(frame.shape[1],frame.shape[0]))
+        self.writer.write(frame)
+        self.stats.encodeTime += time.perf_counter()-before
+
+    def release(self):
+        if self.writer is not None:
+            self.writer.release()
+
+#Encode the frames of queue until None
+#After an error the frames are still taken from the queue so the renderer never blocks, the error is kept in failure
+def encodeQueue(queue:Queue,writer:FrameWriter,failure:list):
+    while True:
+        frame = queue.get()
+        if frame is None:
+            break
+        if not failure:
+            try:
+                writer.write(frame)
+            except Exception as error:
+                failure.append(error)
+    writer.release()
+
+#Write frames to an mp4 as they are produced. Rendering runs in the calling thread and encoding in a writer thread,
+#with at most queueFrames frames, and never more than QUEUE_BYTES (but at least one frame), between them, so the two
+#overlap (opencv encodes without holding the GIL). Every frame is copied into the queue, the renderers reuse their buffer.
+#queueFrames=0 encodes in the calling thread. Returns the EncodeStats
+def writeVideo(frames,filename,fps=15,total=None,queueFrames=QUEUE_FRAMES,progress=True):
+    stats = EncodeStats()
+    started = time.perf_counter()
+    writer = FrameWriter(filename,fps,stats)
+    #The queue is sized by the first frame
+    queue = thread = None
+    failure = []
+    frames = iter(tqdm(frames,total=total) if progress else frames)
+    try:
+        while True:
+            before = time.perf_counter()
+            frame = next(frames,None)
+            if frame is None:
+                break
+            if queueFrames>0:
+                frame = frame.copy()
+            stats.renderTime += time.perf_counter()-before
+            stats.frames += 1
+            if queueFrames>0:
+                if queue is None:
+                    queue = Queue(max(1,min(queueFrames,QUEUE_BYTES//frame.nbytes)))
+                    thread = threading.Thread(target=encodeQueue,args=(queue,writer,failure),daemon=True)
+                    thread.start()
+                queue.put(frame)
+            else:
+                writer.write(frame)
+    finally:
+        if thread is not None:
+            queue.put(None)
+            thread.join()
+        else:
+            writer.release()
+    if failure:
+        raise failure[0]
+    stats.wallTime = time.perf_counter()-started
+    return stats
+
+#Worker side of writeVideoParallel, the map, scene and robot settings of the parent are set up again
+#(spawned workers start from the defaults)
+def segmentWorkerInit(settings):
+    planner.applySettings(settings)
+
+#Frames first to last of the video into filename. The canvas is built up by rendering the frames before first
+#without encoding them, painting is cheap next to encoding
+def segmentWorkerWrite(task):
+    result,cells,frameEnds,steps,first,last,filename,fps = task
+    frames = islice(renderFrames(result,frameEnds,steps,cells),first,last)
+    return writeVideo(frames,filename,fps,queueFrames=0,progress=False)
+
+#Write the frames of renderFrames(result,frameEnds,steps) as processes segments encoded in parallel processes,
+#joined by ffmpeg without encoding again. Without ffmpeg, or for short videos, it is writeVideo
+#Returns the EncodeStats, with the seconds of all the segments added up
+def writeVideoParallel(result,frameEnds,steps,filename,fps=15,processes=None,queueFrames=QUEUE_FRAMES):
+    total = frameCount(result,frameEnds,steps)
+    processes = os.cpu_count() if processes is None else processes
+    processes = min(processes,total//MIN_SEGMENT_FRAMES)
+    ffmpeg = shutil.which("ffmpeg")
+    if processes<=1 or ffmpeg is None:
+        if processes>1:
+            print("ffmpeg not found, the segments can not be joined, encoding in one process")
+        return writeVideo(renderFrames(result,frameEnds,steps),filename,fps,total,queueFrames)
+    started = time.perf_counter()
+    cells = expansionCells(result)
+    #The workers do not need the recorded order, only the cells and the path
+    light = planner.SearchResult(result.path,result.cost,result.expanded)
+    bounds = np.linspace(0,total,processes+1).astype(np.int64)
+    stats = EncodeStats()
+    with tempfile.TemporaryDirectory() as folder:
+        files = [os.path.join(folder,"segment{}.mp4".format(k)) for k in range(processes)]
+        tasks = [(light,cells,frameEnds,steps,int(bounds[k]),int(bounds[k+1]),files[k],fps) for k in range(processes)]
+        with Pool(processes,segmentWorkerInit,(planner.mapSettings(),)) as pool:
+            for segment in tqdm(pool.imap(segmentWorkerWrite,tasks),total=processes):
+                stats.add(segment)
+        listing = os.path.join(folder,"segments.txt")
+        with open(listing,"w") as f:
+            f.writelines("file '{}'\n".format(name) for name in files)
+        subprocess.run([ffmpeg,"-y","-loglevel","error","-f","concat","-safe","0","-i",listing,"-c","copy",filename],check=True)
+    stats.wallTime = time.perf_counter()-started
+    return stats
+
+## Runs everything, saves a video
+#The video has one frame per path cell (twice), or frames frames, or duration seconds at fps,
+#with the exploration sampled by spacing ("linear" or "log")
+#queueFrames bounds the frames between the renderer and the writer thread, processes>1 encodes segments in parallel
+#compare=True prints the expansions the mode saved against Djikstra, which runs a Djikstra search as well
+#metrics=True returns the queryMetrics record of the query with the seconds of every phase (and with traceMemory
+#their peak traced memory), otherwise None
+def djikstraViz(start,end,input_num=0,mode="dijkstra",frames=None,duration=None,fps=15,spacing="linear",queueFrames=QUEUE_FRAMES,processes=1,metrics=False,traceMemory=False,compare=False):
+    YBOUND,XBOUND = mapBounds()
+    if start[0] not in YBOUND or start[1] not in XBOUND:
+        print("START point outside of bounds")
+        return
+    if end[0] not in YBOUND or end[1] not in XBOUND:
+        print("END point outside of bounds")
+        return
+    if not isValidCell(start) or not isValidCell(end):
+        print("START OR GOAL POINT INSIDE OBSTACLE SPACE")
+        return
+    before  = time.time()
+    if mode not in PLANNERS:
+        print("UNKNOWN PLANNER, choose one of {}".format(list(PLANNERS)))
+        return
+    timer = PhaseTimer(traceMemory)
+    #Only the planner is timed, the prints and the optional Djikstra comparison come after the lap
+    result = PLANNERS[mode](start,end,recordOrder=True,metrics=metrics)
+    timer.lap("search")
+    result = printSearchResult(start,end,result,False,mode,compare)
+    timer.skip()
+    print("\r\nTIME FOR DJIKSTRA SOLN:{}".format(time.time()-before))
+    if result is None:
+        timer.stop()
+        print("\r\n NO OUTPUT GENERATED \r\n")
+        return 
+    print("\r\n STARTED VISUALIZATION \r\n")
+    before  = time.time()
+    if duration is not None:
+        frames = int(round(duration*fps))
+    frameEnds,steps = framePlan(result,frames,spacing if frames is not None else "path")
+    timer.lap("framePlan")
+    stats = writeVideoParallel(result,frameEnds,steps,'./viz/PathViz'+str(input_num)+'.mp4',fps,processes,queueFrames)
+    timer.lap("video")
+    timer.stop()
+    timer.phases.update(render=stats.renderTime,encode=stats.encodeTime)
+    print("\r\nTIME FOR VISUALIZATION OUTPUT SOLN:{}".format(time.time()-before))
+    print("FRAMES:{} RENDER FPS:{:.1f} ENCODE FPS:{:.1f} OVERALL FPS:{:.1f}".format(stats.frames,stats.renderFps(),stats.encodeFps(),stats.frames/max(stats.wallTime,1e-9)))
+    print("\r\nFINISHED GENERATING OUTPUT VIDEO at ./viz/ \r\n")
+    if metrics:
+        record = queryMetrics(start,end,mode,result,timer)
+        record.update(frames=stats.frames,renderFps=stats.renderFps(),encodeFps=stats.encodeFps())
+        return record
+    return